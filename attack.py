@@ -1,8 +1,12 @@
 import os
-from dataclasses import dataclass
-from typing import Dict, Literal, Optional
+import threading
+from collections import OrderedDict
+from concurrent.futures import ThreadPoolExecutor
+from dataclasses import astuple, dataclass
+from typing import Dict, List, Literal, Optional, Tuple, Union
 
 import librosa
+import numpy as np
 import soundfile as sf
 
 from cloning_models.fishspeech import FishSpeechCloner
@@ -29,6 +33,9 @@ class AttackConfig:
     num_attack_files: int = 1
 
 class AttackFramework:
+    # Number of environment simulation results kept in memory
+    prep_cache_size = 16
+
     def __init__(self, config: AttackConfig, **kwargs):
         """
         Initialize the attack framework.
@@ -84,8 +91,30 @@ class AttackFramework:
             self.env_simulator = AirEnvironmentSimulator()
         elif config.environment == "line":
             self.env_simulator = EnvironmentSimulator()
+        
+        # Recent environment simulation results, keyed by input file and simulator
+        # settings; _prepare_audio runs on worker threads, so access is locked
+        self._prep_cache: "OrderedDict[Tuple, Tuple[np.ndarray, int]]" = OrderedDict()
+        self._prep_lock = threading.Lock()
+
+    def _simulation_params(self) -> Tuple:
+        """
+        Get the settings of the environment simulator that affect its output.
+        
+        Returns:
+            Tuple: Hashable description of the simulator configuration
+        """
+        if isinstance(self.env_simulator, AirEnvironmentSimulator):
+            return (
+                tuple(tuple(delay) for delay in self.env_simulator.reverb_delays),
+                self.env_simulator.noise_level,
+                self.env_simulator.lowpass_freq,
+                self.env_simulator.filter_order
+            )
+        else:  # EnvironmentSimulator
+            return astuple(self.env_simulator.environments["phone"])
 
-    def _prepare_audio(self, audio_path: str) -> str:
+    def _prepare_audio(self, audio_path: str) -> Tuple[Union[str, np.ndarray], Optional[int]]:
         """
         Apply environment simulation if configured.
         
@@ -93,13 +122,31 @@ class AttackFramework:
             audio_path: Path to the audio file
             
         Returns:
-            str: Path to the processed audio file
+            Tuple[Union[str, np.ndarray], Optional[int]]: (processed audio data, sample rate),
+            or (audio_path, None) if no environment is configured
         """
         if self.env_simulator is None:
-            return audio_path
+            return audio_path, None
+        
+        key = (
+            os.path.abspath(audio_path),
+            os.path.getmtime(audio_path),
+            id(self.env_simulator),
+            self._simulation_params()
+        )
+        with self._prep_lock:
+            if key in self._prep_cache:
+                self._prep_cache.move_to_end(key)
+                return self._prep_cache[key]
             
-        # Load audio
-        audio, sr = librosa.load(audio_path, sr=None)
+        # Load audio as mono float32
+        try:
+            audio, sr = sf.read(audio_path, dtype='float32', always_2d=False)
+            if audio.ndim > 1:
+                audio = audio.mean(axis=1, dtype=np.float32)
+        except RuntimeError:
+            # libsndfile cannot decode every format (e.g. VoxCeleb2's m4a)
+            audio, sr = librosa.load(audio_path, sr=None, mono=True)
         
         # Apply environment simulation
         if isinstance(self.env_simulator, AirEnvironmentSimulator):
@@ -110,11 +157,69 @@ class AttackFramework:
                 environment="phone"  # Default to phone environment
             )
         
-        # Save processed audio
-        output_path = f"processed_{os.path.basename(audio_path)}"
-        sf.write(output_path, processed_audio, sr)
+        with self._prep_lock:
+            self._prep_cache[key] = (processed_audio, sr)
+            if len(self._prep_cache) > self.prep_cache_size:
+                self._prep_cache.popitem(last=False)
+        return processed_audio, sr
+
+    def _prepare_audio_batch(self, audio_paths: List[str]) -> List[Tuple[Union[str, np.ndarray], Optional[int]]]:
+        """
+        Apply environment simulation to several audio files concurrently.
+        
+        Args:
+            audio_paths: Paths to the audio files
+            
+        Returns:
+            List[Tuple[Union[str, np.ndarray], Optional[int]]]: Processed audio for each
+            file, in the same order as audio_paths
+        """
+        if not audio_paths:
+            return []
+        with ThreadPoolExecutor(max_workers=min(8, len(audio_paths))) as executor:
+            return list(executor.map(self._prepare_audio, audio_paths))
+
+    def _test_audio(self, 
+                    audio_paths: List[str], 
+                    prepared: List[Tuple[Union[str, np.ndarray], Optional[int]]]) -> List[Dict]:
+        """
+        Run the authentication system on processed audio samples.
+        
+        Args:
+            audio_paths: Paths to the original audio files
+            prepared: Processed (audio, sample rate) pairs, in the same order as audio_paths
+            
+        Returns:
+            List[Dict]: Test result for each audio sample
+        """
+        if not audio_paths:
+            return []
+        
+        audios = [audio for audio, _ in prepared]
+        srs = [sr for _, sr in prepared]
+        if self.config.task == "verification":
+            # Score all samples in a single vectorized call
+            return [
+                {
+                    "file": audio_path,
+                    "verified": is_verified,
+                    "score": score
+                }
+                for audio_path, (is_verified, score) in zip(
+                    audio_paths, self.auth_system.verify_batch(audios, srs)
+                )
+            ]
         
-        return output_path
+        # csi or osi
+        results = []
+        for audio_path, audio, sr in zip(audio_paths, audios, srs):
+            speaker_id, score = self.auth_system.identify(audio, sr)
+            results.append({
+                "file": audio_path,
+                "identified_speaker": speaker_id,
+                "score": score
+            })
+        return results
 
     def run_attack(self, target_speaker_id: str, attack_text: str) -> Dict:
         """
@@ -156,64 +261,44 @@ class AttackFramework:
             "attack_results": []
         }
         
-        # Test with real audio
-        for test_file in test_files:
-            processed_file = self._prepare_audio(test_file)
-            if self.config.task == "verification":
-                is_verified, score = self.auth_system.verify(processed_file)
-                results["real_test_results"].append({
-                    "file": test_file,
-                    "verified": is_verified,
-                    "score": score
-                })
-            else:  # csi or osi
-                speaker_id, score = self.auth_system.identify(processed_file)
-                results["real_test_results"].append({
-                    "file": test_file,
-                    "identified_speaker": speaker_id,
-                    "score": score
-                })
+        # Test with real audio. Audio is prepared concurrently, while the
+        # authentication models are always called from this thread.
+        results["real_test_results"] = self._test_audio(
+            test_files, self._prepare_audio_batch(test_files)
+        )
         
-        # Generate and test adversarial audio
-        for _ in range(self.config.num_attack_files):
-            # Create voice model
-            if isinstance(self.cloner, FishSpeechCloner):
-                model_id = self.cloner.create_model(
-                    voice_paths=enrollment_files,
-                    model_name=f"attack_{target_speaker_id}"
-                )
-                # Generate attack audio
-                attack_file = self.cloner.generate_audio(
-                    text=attack_text,
-                    model_id=model_id,
-                    output_filename=f"attack_{target_speaker_id}.wav"
-                )
-            else:  # OpenVoiceCloner
-                # Use first enrollment file as reference
-                attack_file = self.cloner.generate_audio(
-                    text=attack_text,
-                    reference_audio_path=enrollment_files[0],
-                    output_path=f"attack_{target_speaker_id}.wav"
-                )
-            
-            # Process attack audio
-            processed_attack = self._prepare_audio(attack_file)
-            
-            # Test attack
-            if self.config.task == "verification":
-                is_verified, score = self.auth_system.verify(processed_attack)
-                results["attack_results"].append({
-                    "file": attack_file,
-                    "verified": is_verified,
-                    "score": score
-                })
-            else:  # csi or osi
-                speaker_id, score = self.auth_system.identify(processed_attack)
-                results["attack_results"].append({
-                    "file": attack_file,
-                    "identified_speaker": speaker_id,
-                    "score": score
-                })
+        # Create voice model once from the enrollment files
+        if isinstance(self.cloner, FishSpeechCloner):
+            model_id = self.cloner.create_model(
+                voice_paths=enrollment_files,
+                model_name=f"attack_{target_speaker_id}"
+            )
+        
+        # Generate adversarial audio. Each file is prepared in the background
+        # while the cloner generates the next one.
+        attack_files = []
+        futures = []
+        with ThreadPoolExecutor(max_workers=max(1, min(8, self.config.num_attack_files))) as executor:
+            for i in range(self.config.num_attack_files):
+                if isinstance(self.cloner, FishSpeechCloner):
+                    attack_file = self.cloner.generate_audio(
+                        text=attack_text,
+                        model_id=model_id,
+                        output_filename=f"attack_{target_speaker_id}_{i}.wav"
+                    )
+                else:  # OpenVoiceCloner
+                    # Use first enrollment file as reference
+                    attack_file = self.cloner.generate_audio(
+                        text=attack_text,
+                        reference_audio_path=enrollment_files[0],
+                        output_path=f"attack_{target_speaker_id}_{i}.wav"
+                    )
+                attack_files.append(attack_file)
+                futures.append(executor.submit(self._prepare_audio, attack_file))
+            prepared = [future.result() for future in futures]
+        
+        # Test adversarial audio
+        results["attack_results"] = self._test_audio(attack_files, prepared)
         
         return results
 
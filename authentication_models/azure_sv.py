@@ -1,6 +1,12 @@
-from typing import List, Union
+import io
+from concurrent.futures import ThreadPoolExecutor
+from typing import List, Optional, Tuple, Union
 
+import numpy as np
 import requests
+import soundfile as sf
+from requests.adapters import HTTPAdapter
+from urllib3.util.retry import Retry
 
 
 class AzureSpeakerVerification:
@@ -13,6 +19,19 @@ class AzureSpeakerVerification:
             'Content-Type': 'application/json'
         }
         self.profile_id = None
+        
+        # Reuse connections across requests to the same endpoint
+        self._session = requests.Session()
+        self._session.headers.update(self.headers)
+        self._session.mount(self.base_url, HTTPAdapter(
+            pool_connections=4,
+            pool_maxsize=8,
+            max_retries=Retry(
+                total=3,
+                backoff_factor=0.3,
+                status_forcelist=[429, 500, 502, 503, 504]
+            )
+        ))
 
     def _create_profile(self) -> str:
         """Create a new verification profile."""
@@ -20,9 +39,8 @@ class AzureSpeakerVerification:
             "locale": "en-US"
         }
 
-        response = requests.post(
+        response = self._session.post(
             f"{self.base_url}/text-independent/profiles",
-            headers=self.headers,
             json=data
         )
 
@@ -37,7 +55,7 @@ class AzureSpeakerVerification:
     def _get_profile_status(self, profile_id: str) -> str:
         """Get the enrollment status of a profile."""
         status_url = f"{self.base_url}/text-independent/profiles/{profile_id}"
-        status_response = requests.get(status_url, headers=self.headers)
+        status_response = self._session.get(status_url)
         if status_response.status_code == 200:
             profile = status_response.json()
             return profile["enrollmentStatus"]
@@ -61,12 +79,11 @@ class AzureSpeakerVerification:
             with open(wav_file_path, 'rb') as audio:
                 audio_data = audio.read()
 
-            enroll_headers = {
-                'Ocp-Apim-Subscription-Key': self.subscription_key,
-                'Content-Type': 'audio/wav'
-            }
-
-            response = requests.post(enroll_url, headers=enroll_headers, data=audio_data)
+            response = self._session.post(
+                enroll_url,
+                headers={'Content-Type': 'audio/wav'},
+                data=audio_data
+            )
             if response.status_code == 200:
                 print(f"Successfully enrolled file: {wav_file_path}")
                 return True
@@ -101,11 +118,9 @@ class AzureSpeakerVerification:
             if not self.profile_id:
                 return None
 
-        # Enroll each file
-        successful_enrollments = 0
-        for wav_file in wav_files:
-            if self._enroll_single_file(wav_file):
-                successful_enrollments += 1
+        # Upload all files concurrently; _enroll_single_file handles its own errors
+        with ThreadPoolExecutor(max_workers=min(8, len(wav_files))) as executor:
+            successful_enrollments = sum(executor.map(self._enroll_single_file, wav_files))
 
         if successful_enrollments > 0:
             print(f"Successfully enrolled {successful_enrollments} out of {len(wav_files)} files")
@@ -114,35 +129,62 @@ class AzureSpeakerVerification:
             print("Failed to enroll any files")
             return None
 
-    def verify(self, wav_file_path: str) -> bool:
+    def verify(self, 
+               wav_file_path: Union[str, np.ndarray], 
+               sr: Optional[int] = None) -> Tuple[bool, float]:
         """
         Verify a speaker using their voice sample.
         
         Args:
-            wav_file_path: Path to the WAV file containing the voice sample to verify
+            wav_file_path: Path to the WAV file containing the voice sample to verify,
+                or the audio data itself
+            sr: Sample rate of the audio data (ignored for paths)
             
         Returns:
-            bool: True if verification is successful, False otherwise
+            Tuple[bool, float]: (verification result, similarity score)
         """
         if not self.profile_id:
             print("No profile ID available. Please enroll first.")
-            return False
+            return False, 0.0
 
         verify_url = f"{self.base_url}/text-independent/profiles/{self.profile_id}/verify"
 
-        with open(wav_file_path, 'rb') as audio:
-            audio_data = audio.read()
-
-        verify_headers = {
-            'Ocp-Apim-Subscription-Key': self.subscription_key,
-            'Content-Type': 'audio/wav'
-        }
-
-        response = requests.post(verify_url, headers=verify_headers, data=audio_data)
+        if isinstance(wav_file_path, str):
+            with open(wav_file_path, 'rb') as audio:
+                audio_data = audio.read()
+        else:
+            # Encode the audio data as an in-memory WAV file
+            buffer = io.BytesIO()
+            sf.write(buffer, wav_file_path, sr, format='WAV')
+            audio_data = buffer.getvalue()
+
+        response = self._session.post(
+            verify_url,
+            headers={'Content-Type': 'audio/wav'},
+            data=audio_data
+        )
         if response.status_code == 200:
             result = response.json()
             print(result)
-            return result['recognitionResult']
+            return result['recognitionResult'] == 'Accept', float(result.get('score', 0.0))
         else:
             print("Verification failed:", response.text)
-            return False
\ No newline at end of file
+            return False, 0.0
+
+    def verify_batch(self, 
+                     wav_files: List[Union[str, np.ndarray]], 
+                     srs: Optional[List[Optional[int]]] = None) -> List[Tuple[bool, float]]:
+        """
+        Verify a speaker using several voice samples.
+        
+        Args:
+            wav_files: List of WAV file paths or audio data to verify
+            srs: Sample rates of the audio data, in the same order as wav_files
+                (default: all None, for paths)
+            
+        Returns:
+            List[Tuple[bool, float]]: (verification result, similarity score) for each sample
+        """
+        if srs is None:
+            srs = [None] * len(wav_files)
+        return [self.verify(audio, sr) for audio, sr in zip(wav_files, srs)]
\ No newline at end of file
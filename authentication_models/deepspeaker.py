@@ -1,45 +1,275 @@
-from typing import List, Tuple, Union
+import logging
+import os
+from collections import OrderedDict
+from typing import List, Literal, Optional, Tuple, Union
 
+import librosa
 import numpy as np
-from deep_speaker.audio import read_mfcc
+from deep_speaker.audio import mfcc_fbank, read_mfcc
 from deep_speaker.batcher import sample_from_mfcc
-from deep_speaker.constants import NUM_FRAMES, SAMPLE_RATE
+from deep_speaker.constants import NUM_FBANKS, NUM_FRAMES, SAMPLE_RATE
 from deep_speaker.conv_models import DeepSpeakerModel
 
 from utils import cosine_similarity
 
+log = logging.getLogger(__name__)
+
 
 class DeepSpeakerVerification:
-    def __init__(self, model_path: str, threshold: float = 0.5):
+    # Number of files whose MFCC features are kept in memory
+    mfcc_cache_size = 256
+
+    def __init__(self, 
+                 model_path: str, 
+                 threshold: float = 0.5,
+                 runtime: Literal["keras", "onnx"] = "keras",
+                 dtype: Literal["float32", "int8"] = "float32"):
         """
         Initialize the DeepSpeaker verification system.
         
         Args:
             model_path: Path to the pretrained model weights (.h5 file)
             threshold: Similarity threshold for verification (default: 0.5)
+            runtime: Inference runtime, either the Keras model itself or an
+                ONNX Runtime session exported from it (default: keras)
+            dtype: Weight precision; int8 runs a dynamically quantized copy of
+                the model, through TFLite for keras or ONNX Runtime for onnx
+                (default: float32)
         """
+        if runtime not in ("keras", "onnx"):
+            raise ValueError(f"Unsupported runtime: {runtime}")
+        if dtype not in ("float32", "int8"):
+            raise ValueError(f"Unsupported dtype: {dtype}")
+        
         self.model = DeepSpeakerModel()
         self.model.m.load_weights(model_path, by_name=True)
         self.threshold = threshold
         self.enrollment_embedding = None
+        self._mfcc_cache: "OrderedDict[Tuple[str, float], np.ndarray]" = OrderedDict()
+        self._predict_buf = np.empty((1, NUM_FRAMES, NUM_FBANKS, 1), dtype=np.float32)
+        
+        self._onnx_session = None
+        self._tflite_interpreter = None
+        if runtime == "onnx":
+            self._onnx_session = self._load_onnx_session(model_path, quantize=dtype == "int8")
+        elif dtype == "int8":
+            self._tflite_interpreter = self._load_tflite_interpreter(model_path)
+            self._tflite_input_index = self._tflite_interpreter.get_input_details()[0]["index"]
+            self._tflite_output_index = self._tflite_interpreter.get_output_details()[0]["index"]
+            # Shape the interpreter's tensors are currently allocated for
+            self._tflite_input_shape = None
+
+    def _load_onnx_session(self, model_path: str, quantize: bool = False):
+        """
+        Load an ONNX Runtime session for the model, exporting it on first use.
+        
+        The exported model is cached next to the weights file.
+        
+        Args:
+            model_path: Path to the pretrained model weights (.h5 file)
+            quantize: Whether to run an INT8 dynamically quantized copy of the model
+            
+        Returns:
+            onnxruntime.InferenceSession: Session running the exported model
+        """
+        import onnxruntime as ort
+        
+        onnx_path = os.path.splitext(model_path)[0] + ".onnx"
+        if not os.path.exists(onnx_path):
+            import tensorflow as tf
+            import tf2onnx
+            
+            tf2onnx.convert.from_keras(
+                self.model.m,
+                input_signature=[tf.TensorSpec((None, NUM_FRAMES, NUM_FBANKS, 1), tf.float32, name="input")],
+                output_path=onnx_path
+            )
+        
+        if quantize:
+            from onnxruntime.quantization import QuantType, quantize_dynamic
+            
+            int8_path = os.path.splitext(model_path)[0] + ".int8.onnx"
+            if not os.path.exists(int8_path):
+                quantize_dynamic(onnx_path, int8_path, weight_type=QuantType.QInt8)
+            onnx_path = int8_path
+        
+        options = ort.SessionOptions()
+        options.graph_optimization_level = ort.GraphOptimizationLevel.ORT_ENABLE_ALL
+        available = ort.get_available_providers()
+        providers = [p for p in ["CUDAExecutionProvider", "CPUExecutionProvider"] if p in available]
+        return ort.InferenceSession(onnx_path, sess_options=options, providers=providers)
 
-    def _get_embedding(self, file_path: str) -> np.ndarray:
+    def _load_tflite_interpreter(self, model_path: str):
         """
-        Get the embedding for a single audio file.
+        Load a TFLite interpreter for an INT8 quantized copy of the model.
+        
+        The converted model is cached next to the weights file.
+        
+        Args:
+            model_path: Path to the pretrained model weights (.h5 file)
+            
+        Returns:
+            tf.lite.Interpreter: Interpreter running the quantized model
+        """
+        import tensorflow as tf
+        
+        tflite_path = os.path.splitext(model_path)[0] + ".int8.tflite"
+        if not os.path.exists(tflite_path):
+            converter = tf.lite.TFLiteConverter.from_keras_model(self.model.m)
+            converter.optimizations = [tf.lite.Optimize.DEFAULT]
+            with open(tflite_path, "wb") as f:
+                f.write(converter.convert())
+        
+        return tf.lite.Interpreter(model_path=tflite_path)
+
+    def _run_tflite(self, batch: np.ndarray) -> np.ndarray:
+        """
+        Run the TFLite interpreter on a batch of MFCC features.
+        
+        Args:
+            batch: MFCC feature batch
+            
+        Returns:
+            np.ndarray: The embedding matrix, one row per input
+        """
+        # Reallocate only when the batch size changes
+        if batch.shape != self._tflite_input_shape:
+            self._tflite_interpreter.resize_tensor_input(self._tflite_input_index, batch.shape)
+            self._tflite_interpreter.allocate_tensors()
+            self._tflite_input_shape = batch.shape
+        self._tflite_interpreter.set_tensor(self._tflite_input_index, batch)
+        self._tflite_interpreter.invoke()
+        return self._tflite_interpreter.get_tensor(self._tflite_output_index)
+
+    def _read_mfcc(self, audio: np.ndarray, sr: int) -> np.ndarray:
+        """
+        Compute MFCC features from an in-memory waveform, matching read_mfcc.
+        
+        Args:
+            audio: Audio data
+            sr: Sample rate of the audio
+            
+        Returns:
+            np.ndarray: The MFCC features of the voiced part of the audio
+        """
+        audio = np.asarray(audio, dtype=np.float32)
+        if sr != SAMPLE_RATE:
+            audio = librosa.resample(audio, orig_sr=sr, target_sr=SAMPLE_RATE)
+        
+        # Trim leading and trailing silence
+        energy = np.abs(audio)
+        silence_threshold = np.percentile(energy, 95)
+        offsets = np.where(energy > silence_threshold)[0]
+        audio_voice_only = audio[offsets[0]:offsets[-1]]
+        return mfcc_fbank(audio_voice_only, SAMPLE_RATE)
+
+    def _read_mfcc_cached(self, file_path: str) -> np.ndarray:
+        """
+        Compute MFCC features for an audio file, reusing earlier results.
+        
+        Features are keyed by the file's absolute path and modification time,
+        and only the mfcc_cache_size most recently used files are kept.
         
         Args:
             file_path: Path to the audio file
             
         Returns:
-            np.ndarray: The embedding vector for the audio file
+            np.ndarray: The MFCC features of the voiced part of the audio
+        """
+        key = (os.path.abspath(file_path), os.path.getmtime(file_path))
+        mfcc = self._mfcc_cache.get(key)
+        if mfcc is not None:
+            self._mfcc_cache.move_to_end(key)
+            return mfcc
+        
+        mfcc = read_mfcc(file_path, SAMPLE_RATE)
+        self._mfcc_cache[key] = mfcc
+        if len(self._mfcc_cache) > self.mfcc_cache_size:
+            self._mfcc_cache.popitem(last=False)
+        return mfcc
+
+    def _compute_mfcc(self, 
+                      audio: Union[str, np.ndarray], 
+                      sr: Optional[int] = None) -> Optional[np.ndarray]:
+        """
+        Compute the sampled MFCC features for a single audio input.
+        
+        Args:
+            audio: Audio data or path to audio file
+            sr: Sample rate of the audio data (ignored for paths)
+            
+        Returns:
+            Optional[np.ndarray]: The MFCC features, or None if processing fails
         """
         try:
-            mfcc = sample_from_mfcc(read_mfcc(file_path, SAMPLE_RATE), NUM_FRAMES)
-            embedding = self.model.m.predict(np.expand_dims(mfcc, axis=0), verbose=0)
-            return embedding
-        except Exception as e:
-            print(f"Error processing file {file_path}: {str(e)}")
+            if isinstance(audio, str):
+                mfcc = self._read_mfcc_cached(audio)
+            else:
+                mfcc = self._read_mfcc(audio, sr)
+            return sample_from_mfcc(mfcc, NUM_FRAMES)
+        except Exception:
+            log.warning("Error processing file %s", audio if isinstance(audio, str) else "audio data", exc_info=True)
+            return None
+
+    def _embed_batch(self, mfccs: List[np.ndarray]) -> np.ndarray:
+        """
+        Get the embeddings for a batch of MFCC features in a single forward pass.
+        
+        Args:
+            mfccs: List of MFCC feature arrays
+            
+        Returns:
+            np.ndarray: The embedding matrix, one row per input
+        """
+        # Reuse the input buffer, growing it only for larger batches
+        n = len(mfccs)
+        if self._predict_buf.shape[0] < n:
+            self._predict_buf = np.empty((n, NUM_FRAMES, NUM_FBANKS, 1), dtype=np.float32)
+        batch = self._predict_buf[:n]
+        np.stack(mfccs, axis=0, out=batch)
+        if self._onnx_session is not None:
+            input_name = self._onnx_session.get_inputs()[0].name
+            return self._onnx_session.run(None, {input_name: batch})[0]
+        if self._tflite_interpreter is not None:
+            return self._run_tflite(batch)
+        return self.model.m.predict(batch, batch_size=len(mfccs), verbose=0)
+
+    def _get_embedding(self, 
+                       audio: Union[str, np.ndarray], 
+                       sr: Optional[int] = None) -> Optional[np.ndarray]:
+        """
+        Get the embedding for a single audio input.
+        
+        Args:
+            audio: Audio data or path to audio file
+            sr: Sample rate of the audio data (ignored for paths)
+            
+        Returns:
+            Optional[np.ndarray]: The embedding vector for the audio, or None if processing fails
+        """
+        mfcc = self._compute_mfcc(audio, sr)
+        if mfcc is None:
             return None
+        return self._embed_batch([mfcc])
+
+    def embed(self, 
+              wav_file_path: Union[str, np.ndarray], 
+              sr: Optional[int] = None) -> Optional[np.ndarray]:
+        """
+        Get the speaker embedding of a voice sample.
+        
+        Args:
+            wav_file_path: Path to the WAV file containing the voice sample,
+                or the audio data itself
+            sr: Sample rate of the audio data (ignored for paths)
+            
+        Returns:
+            Optional[np.ndarray]: The float32 embedding vector, or None if processing fails
+        """
+        embedding = self._get_embedding(wav_file_path, sr)
+        if embedding is None:
+            return None
+        return np.asarray(embedding, dtype=np.float32).reshape(-1)
 
     def enroll(self, wav_files: Union[str, List[str]]) -> bool:
         """
@@ -59,47 +289,70 @@ class DeepSpeakerVerification:
             print("No WAV files provided for enrollment")
             return False
 
-        # Get embeddings for all files
-        embeddings = []
-        successful_enrollments = 0
-        
+        # Compute features for all files, then embed them in one forward pass
+        mfccs = []
         for file in wav_files:
-            embedding = self._get_embedding(file)
-            if embedding is not None:
-                embeddings.append(embedding)
-                successful_enrollments += 1
+            mfcc = self._compute_mfcc(file)
+            if mfcc is not None:
+                mfccs.append(mfcc)
+        successful_enrollments = len(mfccs)
 
         if successful_enrollments > 0:
-            # Calculate mean embedding
-            self.enrollment_embedding = np.mean(embeddings, axis=0)
+            self.enrollment_embedding = np.mean(self._embed_batch(mfccs), axis=0, keepdims=True)
             print(f"Successfully enrolled {successful_enrollments} out of {len(wav_files)} files")
             return True
         else:
             print("Failed to enroll any files")
             return False
 
-    def verify(self, wav_file_path: str) -> Tuple[bool, float]:
+    def verify(self, 
+               wav_file_path: Union[str, np.ndarray], 
+               sr: Optional[int] = None) -> Tuple[bool, float]:
         """
         Verify a speaker using their voice sample.
         
         Args:
-            wav_file_path: Path to the WAV file containing the voice sample to verify
+            wav_file_path: Path to the WAV file containing the voice sample to verify,
+                or the audio data itself
+            sr: Sample rate of the audio data (ignored for paths)
             
         Returns:
             Tuple[bool, float]: (verification result, similarity score)
         """
+        return self.verify_batch([wav_file_path], [sr])[0]
+
+    def verify_batch(self, 
+                     wav_files: List[Union[str, np.ndarray]], 
+                     srs: Optional[List[Optional[int]]] = None) -> List[Tuple[bool, float]]:
+        """
+        Verify a speaker using several voice samples, scoring them in one call.
+        
+        Args:
+            wav_files: List of WAV file paths or audio data to verify
+            srs: Sample rates of the audio data, in the same order as wav_files
+                (default: all None, for paths)
+            
+        Returns:
+            List[Tuple[bool, float]]: (verification result, similarity score) for each sample
+        """
+        results = [(False, 0.0)] * len(wav_files)
         if self.enrollment_embedding is None:
             print("No enrollment data available. Please enroll first.")
-            return False, 0.0
-
-        # Get embedding for the test file
-        test_embedding = self._get_embedding(wav_file_path)
-        if test_embedding is None:
-            return False, 0.0
+            return results
+        if srs is None:
+            srs = [None] * len(wav_files)
 
-        # Calculate similarity
-        similarity = cosine_similarity(test_embedding, self.enrollment_embedding)
-        is_verified = similarity > self.threshold
+        # Compute features for all inputs, then embed them in one forward pass
+        mfccs = [self._compute_mfcc(audio, sr) for audio, sr in zip(wav_files, srs)]
+        valid = [i for i, mfcc in enumerate(mfccs) if mfcc is not None]
+        if not valid:
+            return results
+        test_embeddings = self._embed_batch([mfccs[i] for i in valid])
 
-        print(f"Verification result: {'Verified' if is_verified else 'Not verified'} (similarity: {similarity:.3f})")
-        return is_verified, float(similarity)
\ No newline at end of file
+        # Calculate all similarities at once
+        similarities = cosine_similarity(test_embeddings, self.enrollment_embedding)
+        for i, similarity in zip(valid, similarities):
+            is_verified = bool(similarity > self.threshold)
+            log.debug("Verification result: %s (similarity: %.3f)", "Verified" if is_verified else "Not verified", similarity)
+            results[i] = (is_verified, float(similarity))
+        return results
\ No newline at end of file
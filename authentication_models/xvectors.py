@@ -1,46 +1,125 @@
-from typing import List, Optional, Tuple, Union
+import logging
+from contextlib import nullcontext
+from typing import List, Literal, Optional, Tuple, Union
 
 import numpy as np
+import torch
 import torchaudio
 from speechbrain.pretrained import SpeakerRecognition
 
-from utils import cosine_similarity
+from utils import resample_poly
+
+log = logging.getLogger(__name__)
+
+# Sample rate the pretrained x-vector model was trained on
+SAMPLE_RATE = 16000
 
 
 class XVectorVerification:
-    def __init__(self, model_path: str = "speechbrain/spkrec-xvect-voxceleb", threshold: float = 0.5):
+    def __init__(self, 
+                 model_path: str = "speechbrain/spkrec-xvect-voxceleb", 
+                 threshold: float = 0.5,
+                 device: Optional[str] = None,
+                 dtype: Literal["float32", "int8"] = "float32"):
         """
         Initialize the xVector verification system.
         
         Args:
             model_path: Path to the pretrained model or model identifier
             threshold: Similarity threshold for verification (default: 0.5)
+            device: Device to use for inference (default: cuda if available, else cpu)
+            dtype: Weight precision; int8 dynamically quantizes the embedding
+                model's linear layers and requires the cpu device (default: float32)
         """
+        if dtype not in ("float32", "int8"):
+            raise ValueError(f"Unsupported dtype: {dtype}")
+        if dtype == "int8":
+            if device is not None and device != "cpu":
+                raise ValueError("INT8 inference is only supported on cpu")
+            device = "cpu"
+        
+        self.device = device or ("cuda:0" if torch.cuda.is_available() else "cpu")
         self.model = SpeakerRecognition.from_hparams(
             source=model_path,
-            savedir="pretrained_models/spkrec-xvect-voxceleb"
+            savedir="pretrained_models/spkrec-xvect-voxceleb",
+            run_opts={"device": self.device}
         )
+        if dtype == "int8":
+            self.model.mods.embedding_model = torch.ao.quantization.quantize_dynamic(
+                self.model.mods.embedding_model,
+                {torch.nn.Linear},
+                dtype=torch.qint8
+            )
         self.threshold = threshold
         self.enrollment_embedding = None
+        self._enrollment_tensor = None
 
-    def _get_embedding(self, file_path: str) -> Optional[np.ndarray]:
+    def _autocast(self):
         """
-        Get the embedding for a single audio file.
+        Get the mixed precision context for inference.
+        
+        Returns:
+            FP16 autocast on CUDA, a no-op context on CPU
+        """
+        if self.device.startswith("cuda"):
+            return torch.autocast(device_type="cuda", dtype=torch.float16)
+        return nullcontext()
+
+    def _get_embedding(self, 
+                       audio: Union[str, np.ndarray], 
+                       sr: Optional[int] = None) -> Optional[torch.Tensor]:
+        """
+        Get the embedding for a single audio input.
+        
+        The embedding is left on the model's device so that callers can reduce
+        several embeddings before copying anything back to the host.
         
         Args:
-            file_path: Path to the audio file
+            audio: Audio data or path to audio file
+            sr: Sample rate of the audio data; data at other rates is resampled
+                to the model's 16 kHz, and None means it is already at 16 kHz
+                (ignored for paths)
             
         Returns:
-            Optional[np.ndarray]: The embedding vector for the audio file, or None if processing fails
+            Optional[torch.Tensor]: The FP32 embedding vector for the audio, or None if processing fails
         """
         try:
-            signal, fs = torchaudio.load(file_path)
-            embedding = self.model.encode_batch(signal).squeeze(0).detach().cpu().numpy()
-            return embedding
-        except Exception as e:
-            print(f"Error processing file {file_path}: {str(e)}")
+            if isinstance(audio, str):
+                signal, fs = torchaudio.load(audio)
+            else:
+                audio = np.asarray(audio, dtype=np.float32)
+                if sr is not None and sr != SAMPLE_RATE:
+                    audio = resample_poly(audio, sr, SAMPLE_RATE).astype(np.float32, copy=False)
+                signal = torch.from_numpy(audio).unsqueeze(0)
+            signal = signal.to(self.device, non_blocking=True)
+            with torch.inference_mode(), self._autocast():
+                embedding = self.model.encode_batch(signal)
+            return embedding.squeeze(0).float()
+        except Exception:
+            log.warning("Error processing file %s", audio if isinstance(audio, str) else "audio data", exc_info=True)
             return None
 
+    def embed(self, 
+              wav_file_path: Union[str, np.ndarray], 
+              sr: Optional[int] = None) -> Optional[np.ndarray]:
+        """
+        Get the speaker embedding of a voice sample.
+        
+        Args:
+            wav_file_path: Path to the WAV file containing the voice sample,
+                or the audio data itself
+            sr: Sample rate of the audio data; data at other rates is resampled
+                to the model's 16 kHz, and None means it is already at 16 kHz
+                (ignored for paths)
+            
+        Returns:
+            Optional[np.ndarray]: The float32 embedding vector, or None if processing fails
+        """
+        embedding = self._get_embedding(wav_file_path, sr)
+        if embedding is None:
+            return None
+        return embedding.cpu().numpy().reshape(-1)
+
     def enroll(self, wav_files: Union[str, List[str]]) -> bool:
         """
         Enroll a speaker using one or multiple voice samples.
@@ -70,36 +149,67 @@ class XVectorVerification:
                 successful_enrollments += 1
 
         if successful_enrollments > 0:
-            # Calculate mean embedding
-            self.enrollment_embedding = np.mean(embeddings, axis=0)
+            # Reduce on the device and copy only the mean back to the host
+            self._enrollment_tensor = torch.cat(embeddings, dim=0).mean(dim=0, keepdim=True)
+            self.enrollment_embedding = self._enrollment_tensor.cpu().numpy()
             print(f"Successfully enrolled {successful_enrollments} out of {len(wav_files)} files")
             return True
         else:
             print("Failed to enroll any files")
             return False
 
-    def verify(self, wav_file_path: str) -> Tuple[bool, float]:
+    def verify(self, 
+               wav_file_path: Union[str, np.ndarray], 
+               sr: Optional[int] = None) -> Tuple[bool, float]:
         """
         Verify a speaker using their voice sample.
         
         Args:
-            wav_file_path: Path to the WAV file containing the voice sample to verify
+            wav_file_path: Path to the WAV file containing the voice sample to verify,
+                or the audio data itself
+            sr: Sample rate of the audio data; data at other rates is resampled
+                to the model's 16 kHz, and None means it is already at 16 kHz
+                (ignored for paths)
             
         Returns:
             Tuple[bool, float]: (verification result, similarity score)
         """
+        return self.verify_batch([wav_file_path], [sr])[0]
+
+    def verify_batch(self, 
+                     wav_files: List[Union[str, np.ndarray]], 
+                     srs: Optional[List[Optional[int]]] = None) -> List[Tuple[bool, float]]:
+        """
+        Verify a speaker using several voice samples, scoring them in one call.
+        
+        Args:
+            wav_files: List of WAV file paths or audio data to verify
+            srs: Sample rates of the audio data, in the same order as wav_files
+                (default: all None, for paths)
+            
+        Returns:
+            List[Tuple[bool, float]]: (verification result, similarity score) for each sample
+        """
+        results = [(False, 0.0)] * len(wav_files)
         if self.enrollment_embedding is None:
             print("No enrollment data available. Please enroll first.")
-            return False, 0.0
-
-        # Get embedding for the test file
-        test_embedding = self._get_embedding(wav_file_path)
-        if test_embedding is None:
-            return False, 0.0
+            return results
+        if srs is None:
+            srs = [None] * len(wav_files)
 
-        # Calculate similarity
-        similarity = cosine_similarity(test_embedding, self.enrollment_embedding)
-        is_verified = similarity > self.threshold
+        # Get embeddings for all inputs
+        embeddings = [self._get_embedding(audio, sr) for audio, sr in zip(wav_files, srs)]
+        valid = [i for i, embedding in enumerate(embeddings) if embedding is not None]
+        if not valid:
+            return results
+        test_embeddings = torch.cat([embeddings[i] for i in valid], dim=0)
 
-        print(f"Verification result: {'Verified' if is_verified else 'Not verified'} (similarity: {similarity:.3f})")
-        return is_verified, float(similarity)
\ No newline at end of file
+        # Calculate all similarities at once on the device, copying back only the scores
+        similarities = torch.nn.functional.cosine_similarity(
+            test_embeddings, self._enrollment_tensor, dim=-1
+        ).cpu().numpy()
+        for i, similarity in zip(valid, similarities):
+            is_verified = bool(similarity > self.threshold)
+            log.debug("Verification result: %s (similarity: %.3f)", "Verified" if is_verified else "Not verified", similarity)
+            results[i] = (is_verified, float(similarity))
+        return results
\ No newline at end of file
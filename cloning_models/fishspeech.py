@@ -1,9 +1,37 @@
 import os
+from concurrent.futures import ThreadPoolExecutor
 from typing import List
 
 from fish_audio_sdk import Session, TTSRequest
 
 
+def _read_all(path: str) -> bytes:
+    """
+    Read a whole file with a single sequential read.
+    
+    Args:
+        path: Path to the file
+        
+    Returns:
+        bytes: Contents of the file
+    """
+    fd = os.open(path, os.O_RDONLY)
+    try:
+        if hasattr(os, "posix_fadvise"):
+            os.posix_fadvise(fd, 0, 0, os.POSIX_FADV_SEQUENTIAL)
+        size = os.fstat(fd).st_size
+        chunks = []
+        while size > 0:
+            chunk = os.read(fd, size)
+            if not chunk:
+                break
+            chunks.append(chunk)
+            size -= len(chunk)
+        return b"".join(chunks)
+    finally:
+        os.close(fd)
+
+
 class FishSpeechCloner:
     def __init__(self, api_key: str, output_dir: str = "/path/to/cloned_with_fish"):
         """
@@ -17,7 +45,9 @@ class FishSpeechCloner:
         self.output_dir = output_dir
         os.makedirs(output_dir, exist_ok=True)
 
-    def create_model(self, voice_paths: List[str], model_name: str) -> str:
+    def create_model(self, 
+                     voice_paths: List[str], 
+                     model_name: str) -> str:
         """
         Create a voice model from reference audio files.
         
@@ -28,10 +58,8 @@ class FishSpeechCloner:
         Returns:
             str: Model ID for future use
         """
-        voices = []
-        for path in voice_paths:
-            with open(path, "rb") as f:
-                voices.append(f.read())
+        with ThreadPoolExecutor(max_workers=max(1, min(8, len(voice_paths)))) as executor:
+            voices = list(executor.map(_read_all, voice_paths))
         
         model = self.session.create_model(
             title=model_name,
@@ -56,7 +84,8 @@ class FishSpeechCloner:
         """
         output_path = os.path.join(self.output_dir, output_filename)
         
-        with open(output_path, "wb") as f:
+        # Use a large buffer so small streamed chunks are coalesced into few writes
+        with open(output_path, "wb", buffering=1 << 20) as f:
             for chunk in self.session.tts(TTSRequest(
                 reference_id=model_id,
                 text=text
@@ -1,6 +1,8 @@
+import hashlib
 import os
-import shutil
-from typing import Optional
+import tempfile
+from contextlib import nullcontext
+from typing import Dict, Optional, Tuple
 
 import torch
 from melo.api import TTS
@@ -31,6 +33,7 @@ class OpenVoiceCloner:
             device=self.device
         )
         self.tone_color_converter.load_ckpt(f'{converter_checkpoint_dir}/checkpoint.pth')
+        self.tone_color_converter.model.eval()
         
         # Initialize TTS model
         self.tts_model = TTS(language="EN_NEWEST", device=self.device)
@@ -41,6 +44,66 @@ class OpenVoiceCloner:
         self.src_dir = "/kaggle/working/DUMMY_SRC"
         os.makedirs(self.temp_dir, exist_ok=True)
         os.makedirs(self.src_dir, exist_ok=True)
+        
+        # Target speaker embedding cache
+        self._se_cache: Dict[Tuple[str, float], torch.Tensor] = {}
+        
+        # Load every base speaker embedding onto the device once
+        self._source_ses: Dict[str, torch.Tensor] = {}
+        for key in self.speaker_ids.keys():
+            key = key.lower().replace('_', '-')
+            self._source_ses[key] = torch.load(
+                f'/kaggle/working/OpenVoice/checkpoints_v2/base_speakers/ses/{key}.pth',
+                map_location=self.device
+            )
+
+    def _autocast(self):
+        """
+        Get the mixed precision context for inference.
+        
+        Returns:
+            FP16 autocast on CUDA, a no-op context on CPU
+        """
+        if self.device.startswith("cuda"):
+            return torch.autocast(device_type="cuda", dtype=torch.float16)
+        return nullcontext()
+
+    def _get_target_se(self, reference_audio_path: str) -> torch.Tensor:
+        """
+        Get the speaker embedding of a reference audio file, reusing cached results.
+        
+        Embeddings are cached in memory and on disk, keyed by the absolute
+        path and modification time of the reference file.
+        
+        Args:
+            reference_audio_path: Path to the reference audio file
+            
+        Returns:
+            torch.Tensor: The target speaker embedding
+        """
+        abs_path = os.path.abspath(reference_audio_path)
+        key = (abs_path, os.path.getmtime(abs_path))
+        if key in self._se_cache:
+            return self._se_cache[key]
+        
+        digest = hashlib.sha1(f"{key[0]}:{key[1]}".encode()).hexdigest()
+        cache_path = os.path.join(self.temp_dir, f"{digest}_se.pth")
+        if os.path.exists(cache_path):
+            target_se = torch.load(cache_path, map_location=self.device)
+        else:
+            # get_se keys its scratch files on the file's base name, which is not
+            # unique across speakers, so give every extraction its own directory
+            with tempfile.TemporaryDirectory(dir=self.temp_dir) as target_dir:
+                target_se, _ = se_extractor.get_se(
+                    reference_audio_path,
+                    self.tone_color_converter,
+                    target_dir=target_dir,
+                    vad=True
+                )
+            torch.save(target_se, cache_path)
+        
+        self._se_cache[key] = target_se
+        return target_se
 
     def create_model(self, reference_audio_path: str, model_name: str) -> str:
         """
@@ -53,25 +116,13 @@ class OpenVoiceCloner:
         Returns:
             str: Path to the saved speaker embedding
         """
-        # Create a copy of the reference file
-        file_name = os.path.basename(reference_audio_path)
-        copied_file_path = os.path.join(self.temp_dir, f"copy_{file_name}")
-        shutil.copyfile(reference_audio_path, copied_file_path)
-        
         # Extract speaker embedding
-        target_se, _ = se_extractor.get_se(
-            copied_file_path,
-            self.tone_color_converter,
-            vad=True
-        )
+        target_se = self._get_target_se(reference_audio_path)
         
         # Save the speaker embedding
         output_path = os.path.join(self.temp_dir, f"{model_name}_se.pth")
         torch.save(target_se, output_path)
         
-        # Clean up
-        os.remove(copied_file_path)
-        
         return output_path
 
     def generate_audio(self, 
@@ -92,11 +143,7 @@ class OpenVoiceCloner:
             str: Path to the generated audio file
         """
         # Get speaker embedding
-        target_se, _ = se_extractor.get_se(
-            reference_audio_path,
-            self.tone_color_converter,
-            vad=True
-        )
+        target_se = self._get_target_se(reference_audio_path)
         
         # Select speaker
         if speaker_name is None:
@@ -109,23 +156,22 @@ class OpenVoiceCloner:
         
         # Generate source audio
         src_path = os.path.join(self.src_dir, 'tmp.wav')
-        self.tts_model.tts_to_file(text, speaker_id, src_path, speed=self.speed)
+        with torch.inference_mode(), self._autocast():
+            self.tts_model.tts_to_file(text, speaker_id, src_path, speed=self.speed)
         
-        # Load source speaker embedding
-        source_se = torch.load(
-            f'/kaggle/working/OpenVoice/checkpoints_v2/base_speakers/ses/{speaker_key}.pth',
-            map_location=self.device
-        )
+        # Get source speaker embedding
+        source_se = self._source_ses[speaker_key]
         
         # Convert voice
         encode_message = "@MyShell"
-        self.tone_color_converter.convert(
-            audio_src_path=src_path,
-            src_se=source_se,
-            tgt_se=target_se,
-            output_path=output_path,
-            message=encode_message
-        )
+        with torch.inference_mode(), self._autocast():
+            self.tone_color_converter.convert(
+                audio_src_path=src_path,
+                src_se=source_se,
+                tgt_se=target_se,
+                output_path=output_path,
+                message=encode_message
+            )
         
         # Clean up
         os.remove(src_path)
@@ -1,10 +1,42 @@
 import glob
+import os
+import json
+from concurrent.futures import ThreadPoolExecutor
 from pathlib import Path
-from typing import Dict, List
+from typing import Dict, Iterator, List, Optional
+
+
+def _iter_audio(root: str, suffix: str) -> Iterator[str]:
+    """
+    Recursively yield paths of files under a directory with a given suffix.
+    
+    Uses an explicit stack over os.scandir, so entry types come from the
+    directory listing itself without extra stat calls.
+    
+    Args:
+        root: Directory to walk
+        suffix: File name suffix to match, e.g. ".wav"
+        
+    Yields:
+        str: Path to each matching file
+    """
+    stack = [root]
+    while stack:
+        with os.scandir(stack.pop()) as entries:
+            for entry in entries:
+                if entry.is_dir(follow_symlinks=False):
+                    stack.append(entry.path)
+                elif entry.name.endswith(suffix):
+                    yield entry.path
 
 
 class DataLoader:
     VALID_DATASETS = ["VoxCeleb1", "VoxCeleb2", "LibriSpeech"]
+    VALID_MODES = ["intragender", "intergender"]
+    EXTENSIONS = {"VoxCeleb1": "wav", "VoxCeleb2": "m4a", "LibriSpeech": "flac"}
+    CACHE_FILENAME = ".dataloader_cache.json"
+    # Bump when the scan logic changes, so caches written by older scans are ignored
+    CACHE_VERSION = 2
     
     def __init__(
         self,
@@ -20,6 +52,8 @@ class DataLoader:
         """
         if dataset not in self.VALID_DATASETS:
             raise ValueError(f"Dataset must be one of {self.VALID_DATASETS}, got {dataset}")
+        if mode not in self.VALID_MODES:
+            raise ValueError(f"Mode must be one of {self.VALID_MODES}, got {mode}")
 
         self.dataset = dataset
         dataset_folder = (
@@ -35,6 +69,20 @@ class DataLoader:
         self.mode = mode
         self.gender_metadata = gender_metadata
         self._files = self._collect_files()
+        
+        # Gender lookups and attacker pools, built once from the metadata
+        self._gender = self._load_gender_metadata() if gender_metadata else {}
+        self.speakers_by_gender: Dict[str, List[str]] = {}
+        for user_id in self._files:
+            if user_id in self._gender:
+                self.speakers_by_gender.setdefault(self._gender[user_id], []).append(user_id)
+        self._partner_pools: Dict[str, List[str]] = {
+            gender: (
+                speakers if mode == "intragender"
+                else [s for other, pool in self.speakers_by_gender.items() if other != gender for s in pool]
+            )
+            for gender, speakers in self.speakers_by_gender.items()
+        }
 
     def get_files(self) -> Dict[str, List[str]]:
         """
@@ -45,43 +93,132 @@ class DataLoader:
         """
         return self._files
 
+    def get_gender(self, user_id: str) -> Optional[str]:
+        """
+        Get the gender of a user from the metadata.
+        
+        Args:
+            user_id: ID of the user
+            
+        Returns:
+            Optional[str]: "m" or "f", or None if the user has no metadata
+        """
+        return self._gender.get(user_id)
+
+    def get_attacker_speakers(self, target_speaker_id: str) -> List[str]:
+        """
+        Get the speakers that may attack a target speaker under the configured mode.
+        
+        Args:
+            target_speaker_id: ID of the target speaker
+            
+        Returns:
+            List[str]: Same-gender speakers for "intragender" mode, or speakers of
+            the other gender for "intergender" mode, excluding the target itself
+        """
+        gender = self._gender.get(target_speaker_id)
+        if gender is None:
+            return []
+        return [s for s in self._partner_pools.get(gender, []) if s != target_speaker_id]
+
+    def _load_gender_metadata(self) -> Dict[str, str]:
+        """
+        Parses the gender metadata file into a mapping of user ID to gender.
+        
+        Supports the VoxCeleb meta CSVs, which have a "Gender" column, and
+        LibriSpeech's SPEAKERS.TXT, whose ';' comment lines hide the header
+        and whose second column is the speaker's sex. pandas is only needed for
+        the VoxCeleb files.
+        
+        Returns:
+            Dict[str, str]: Dictionary mapping user IDs to "m" or "f"
+        """
+        if self.dataset == "LibriSpeech":
+            # Split by hand: the trailing NAME field may itself contain '|'
+            genders = {}
+            with open(self.gender_metadata, encoding="utf-8") as f:
+                for line in f:
+                    if line.startswith(";") or not line.strip():
+                        continue
+                    fields = line.split("|", 2)
+                    if len(fields) >= 2:
+                        genders[fields[0].strip()] = fields[1].strip().lower()
+            return genders
+
+        import pandas as pd
+
+        df = pd.read_csv(self.gender_metadata, sep=None, engine="python", dtype=str)
+        df.columns = df.columns.str.strip()
+        return dict(zip(df.iloc[:, 0].str.strip(), df["Gender"].str.strip().str.lower()))
+
     def _collect_files(self) -> Dict[str, List[str]]:
         """
         Collects files for each user in the dataset.
         
+        The result of a scan is cached as JSON in the dataset folder and reused
+        while the cache is at least as new as the folder itself and was written
+        by the same scan version for the same dataset and extension. Changes
+        nested below the speaker directories do not touch the folder's mtime;
+        delete the cache file to force a rescan after such changes.
+        
         Returns:
             Dict[str, List[str]]: Dictionary mapping user IDs to their audio file paths
         """
-        files = {}
         if not self.base_path.exists():
-            return files
+            return {}
 
-        ext = (
-            "m4a"
-            if self.dataset_folder == "aac"
-            else "wav" if self.dataset_folder == "wav" else "flac"
-        )
+        cache_path = self.base_path / self.CACHE_FILENAME
+        cache_tag = {
+            "version": self.CACHE_VERSION,
+            "dataset": self.dataset,
+            "ext": self.EXTENSIONS[self.dataset],
+        }
+        try:
+            # Creating the cache bumps the folder's mtime within the same clock
+            # tick as the cache write, so equal timestamps still count as fresh
+            if cache_path.stat().st_mtime >= self.base_path.stat().st_mtime:
+                with open(cache_path, "r", encoding="utf-8") as f:
+                    cache = json.load(f)
+                if cache.get("tag") == cache_tag:
+                    return cache["files"]
+        except (OSError, ValueError, KeyError, AttributeError):
+            pass
 
-        if self.dataset == "LibriSpeech":
-            for subset in self.base_path.iterdir():
-                if subset.is_dir():
-                    for user_id in subset.iterdir():
-                        if user_id.is_dir():
-                            uid = user_id.name
-                            if uid not in files:
-                                files[uid] = []
-                            files[uid].extend(
-                                glob.glob(
-                                    str(user_id / "**" / f"*.{ext}"), recursive=True
-                                )
-                            )
-        else:
-            for user_id in self.base_path.iterdir():
-                if user_id.is_dir():
-                    uid = user_id.name
-                    files[uid] = glob.glob(
-                        str(user_id / "**" / f"*.{ext}"), recursive=True
-                    )
+        files = self._scan_files()
+        try:
+            with open(cache_path, "w", encoding="utf-8") as f:
+                json.dump({"tag": cache_tag, "files": files}, f)
+        except OSError:
+            # The dataset folder may be read-only
+            pass
 
         return files
 
+    def _scan_files(self) -> Dict[str, List[str]]:
+        """
+        Walks the dataset folder and collects files for each user.
+        
+        Returns:
+            Dict[str, List[str]]: Dictionary mapping user IDs to their audio file paths
+        """
+        files = {}
+        ext = self.EXTENSIONS[self.dataset]
+
+        # LibriSpeech has a fixed <subset>/<speaker>/<chapter>/<file> layout,
+        # so a single depth-limited glob finds every file
+        if self.dataset == "LibriSpeech":
+            pattern = os.path.join(str(self.base_path), "*", "*", "*", f"*.{ext}")
+            for path in glob.iglob(pattern):
+                files.setdefault(path.rsplit(os.sep, 3)[-3], []).append(path)
+            return files
+
+        user_dirs = [user_id for user_id in self.base_path.iterdir() if user_id.is_dir()]
+
+        # Walk user directories concurrently, the walk is bound by filesystem latency
+        max_workers = min(64, (os.cpu_count() or 1) * 8)
+        with ThreadPoolExecutor(max_workers=max_workers) as executor:
+            user_files = executor.map(lambda user_id: list(_iter_audio(str(user_id), f".{ext}")), user_dirs)
+            for user_id, paths in zip(user_dirs, user_files):
+                files.setdefault(user_id.name, []).extend(paths)
+
+        return files
@@ -1,11 +1,27 @@
 import os
+import shutil
 import subprocess
 import sys
 import tarfile
+import threading
 import zipfile
+from concurrent.futures import ThreadPoolExecutor
 from pathlib import Path
 
 BASE_OUTPUT_DIR = Path(__file__).resolve().parent / "data"
+COPY_BUFSIZE = 1 << 20
+
+
+class _FastTarFile(tarfile.TarFile):
+    # Dataset members only need their contents; skip restoring per-file metadata.
+    # Directories are created with mode 0700 and only opened up by chmod, so
+    # their modes are still restored.
+    def chmod(self, tarinfo, targetpath):
+        if tarinfo.isdir():
+            super().chmod(tarinfo, targetpath)
+
+    def utime(self, tarinfo, targetpath):
+        pass
 
 
 def download_file(url: str, output_dir: str):
@@ -24,21 +40,101 @@ def download_file(url: str, output_dir: str):
     return output_path
 
 
+def _zip_member_path(extract_to: str, member_name: str) -> str:
+    # Same sanitization as ZipFile.extract: drop drive letters, empty parts, "." and ".."
+    arcname = member_name.replace("/", os.path.sep)
+    if os.path.altsep:
+        arcname = arcname.replace(os.path.altsep, os.path.sep)
+    arcname = os.path.splitdrive(arcname)[1]
+    parts = [x for x in arcname.split(os.path.sep) if x not in ("", os.path.curdir, os.path.pardir)]
+    return os.path.join(extract_to, *parts)
+
+
+def extract_zip_parallel(archive_path: str, extract_to: str):
+    with zipfile.ZipFile(archive_path, "r") as zip_ref:
+        members = zip_ref.infolist()
+
+    # Create all directories up front, so workers never race on makedirs
+    directories = set()
+    for member in members:
+        member_path = _zip_member_path(extract_to, member.filename)
+        directories.add(member_path if member.is_dir() else os.path.dirname(member_path))
+    for directory in sorted(directories):
+        os.makedirs(directory, exist_ok=True)
+
+    # ZipFile serializes reads on a shared handle, so every worker opens its own
+    local = threading.local()
+    handles = []
+    handles_lock = threading.Lock()
+
+    def extract_member(member: zipfile.ZipInfo):
+        if not hasattr(local, "zip_ref"):
+            local.zip_ref = zipfile.ZipFile(archive_path, "r")
+            with handles_lock:
+                handles.append(local.zip_ref)
+        with local.zip_ref.open(member) as source, \
+                open(_zip_member_path(extract_to, member.filename), "wb") as target:
+            shutil.copyfileobj(source, target, COPY_BUFSIZE)
+
+    files = [member for member in members if not member.is_dir()]
+    try:
+        with ThreadPoolExecutor(max_workers=min(32, (os.cpu_count() or 1) * 4)) as executor:
+            list(executor.map(extract_member, files))
+    finally:
+        for handle in handles:
+            handle.close()
+
+
 def extract_archive(archive_path: str, extract_to: str):
     os.makedirs(extract_to, exist_ok=True)
 
     if archive_path.endswith(".tar.gz"):
-        with tarfile.open(archive_path, "r:gz") as tar:
+        with _FastTarFile.open(archive_path, "r:gz", copybufsize=COPY_BUFSIZE) as tar:
             tar.extractall(path=extract_to)
     elif archive_path.endswith(".zip"):
-        with zipfile.ZipFile(archive_path, "r") as zip_ref:
-            zip_ref.extractall(extract_to)
+        extract_zip_parallel(archive_path, extract_to)
     else:
         print(f"Unsupported archive format: {archive_path}")
 
     print(f"Extracted {archive_path} to {extract_to}")
 
 
+def stream_extract_tar(url: str, extract_to: str):
+    os.makedirs(extract_to, exist_ok=True)
+    file_name = url.split("/")[-1]
+    marker_path = os.path.join(extract_to, f".{file_name}.extracted")
+
+    if os.path.exists(marker_path):
+        print(f"{file_name} already extracted, skipping download.")
+        return
+
+    # Extract while downloading; "r|gz" reads the archive as a forward-only stream
+    print(f"Downloading and extracting {file_name}...")
+    proc = subprocess.Popen(["wget", "-q", "-O", "-", url], stdout=subprocess.PIPE)
+    try:
+        with _FastTarFile.open(fileobj=proc.stdout, mode="r|gz", copybufsize=COPY_BUFSIZE) as tar:
+            tar.extractall(path=extract_to)
+    finally:
+        proc.stdout.close()
+        returncode = proc.wait()
+    if returncode != 0:
+        raise subprocess.CalledProcessError(returncode, proc.args)
+
+    open(marker_path, "w").close()
+    print(f"Extracted {file_name} to {extract_to}")
+
+
+def download_and_extract(url: str, output_dir: str):
+    if url.endswith(".tar.gz"):
+        stream_extract_tar(url, output_dir)
+    elif url.endswith(".zip"):
+        # zipfile needs a seekable file, so zip archives are downloaded first
+        archive_path = download_file(url, output_dir)
+        extract_archive(archive_path, output_dir)
+    else:
+        download_file(url, output_dir)
+
+
 class DatasetDownloader:
     LIBRISPEECH_URLS = [
         "http://www.openslr.org/resources/12/dev-clean.tar.gz",
@@ -63,20 +159,17 @@ class DatasetDownloader:
     def download_and_extract_librispeech(self):
         librispeech_dir = self.base_dir / "LibriSpeech"
         for url in self.LIBRISPEECH_URLS:
-            archive_path = download_file(url, librispeech_dir)
-            extract_archive(archive_path, librispeech_dir)
+            download_and_extract(url, librispeech_dir)
 
     def download_and_extract_voxceleb1(self):
         voxceleb1_dir = self.base_dir / "wav"
         for url in self.VOXCELEB1_URLS:
-            archive_path = download_file(url, voxceleb1_dir)
-            extract_archive(archive_path, voxceleb1_dir)
+            download_and_extract(url, voxceleb1_dir)
 
     def download_and_extract_voxceleb2(self):
         voxceleb2_dir = self.base_dir / "aac"
         for url in self.VOXCELEB2_URLS:
-            archive_path = download_file(url, voxceleb2_dir)
-            extract_archive(archive_path, voxceleb2_dir)
+            download_and_extract(url, voxceleb2_dir)
 
     def download_dataset(self, dataset_name: str):
         dataset_name = dataset_name.lower()
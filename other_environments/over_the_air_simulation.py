@@ -3,8 +3,15 @@ from typing import List, Optional, Tuple
 import numpy as np
 import scipy.signal
 
+from utils import design_butter, sparse_reverb
+
 
 class AirEnvironmentSimulator:
+    __slots__ = ("_delays_sec", "_amps", "noise_level", "lowpass_freq", "filter_order", "_rng")
+
+    # Impulse responses with more taps than this are applied with FFT convolution
+    max_sparse_taps = 64
+
     def __init__(self, 
                  reverb_delays: Optional[List[Tuple[float, float]]] = None,
                  noise_level: float = 0.005,
@@ -19,14 +26,45 @@ class AirEnvironmentSimulator:
             lowpass_freq: Cutoff frequency for lowpass filter
             filter_order: Order of the lowpass filter
         """
-        self.reverb_delays = reverb_delays or [
+        reverb_delays = reverb_delays or [
             (0.03, 0.6),  # 30ms delay, 0.6 amplitude
             (0.06, 0.3),  # 60ms delay, 0.3 amplitude
             (0.1, 0.1)    # 100ms delay, 0.1 amplitude
         ]
+        # Direct sound first, then the reflections, as parallel arrays
+        self._delays_sec = np.array([0.0] + [delay for delay, _ in reverb_delays], dtype=np.float64)
+        self._amps = np.array([1.0] + [amplitude for _, amplitude in reverb_delays], dtype=np.float64)
         self.noise_level = noise_level
         self.lowpass_freq = lowpass_freq
         self.filter_order = filter_order
+        self._rng = np.random.default_rng()
+
+    @property
+    def reverb_delays(self) -> List[Tuple[float, float]]:
+        """
+        The (delay, amplitude) pairs of the reverb reflections.
+        """
+        return list(zip(self._delays_sec[1:].tolist(), self._amps[1:].tolist()))
+
+    def _apply_reverb(self, audio: np.ndarray, delays: np.ndarray, amps: np.ndarray) -> np.ndarray:
+        """
+        Convolve audio with a sparse impulse response.
+        
+        Args:
+            audio: Input audio data
+            delays: Delay of each tap in samples
+            amps: Amplitude of each tap
+            
+        Returns:
+            np.ndarray: Reverberated audio, truncated to the input length
+        """
+        if len(delays) > self.max_sparse_taps:
+            room_ir = np.zeros(delays.max() + 1)
+            np.add.at(room_ir, delays, amps)
+            return scipy.signal.oaconvolve(audio, room_ir, mode='full')[:len(audio)]
+        
+        # Delay-and-add each tap instead of multiplying through the zeros
+        return sparse_reverb(audio, delays, amps)
 
     def simulate(self, audio: np.ndarray, sr: int) -> np.ndarray:
         """
@@ -39,30 +77,20 @@ class AirEnvironmentSimulator:
         Returns:
             np.ndarray: Processed audio with environmental effects
         """
-        # Add synthetic room reverb
-        room_ir = np.zeros(sr)
-        room_ir[0] = 1.0  # Direct sound
+        audio = np.asarray(audio, dtype=np.float32)
         
-        # Add delayed reflections
-        for delay, amplitude in self.reverb_delays:
-            delay_samples = int(delay * sr)
-            room_ir[delay_samples] = amplitude
-            
-        reverb = np.convolve(audio, room_ir)[:len(audio)]
+        # Add synthetic room reverb: direct sound plus delayed reflections
+        delay_samples = (self._delays_sec * sr).astype(np.int64)
+        reverb = self._apply_reverb(audio, delay_samples, self._amps)
 
-        # Add background noise
-        noise = np.random.normal(0, self.noise_level, len(audio))
-        noisy = reverb + noise
+        # Add background noise in place
+        noise = self._rng.standard_normal(len(audio), dtype=np.float32)
+        noise *= self.noise_level
+        reverb += noise
 
         # Apply lowpass filter for mic frequency drop-off
-        sos = scipy.signal.butter(
-            self.filter_order, 
-            self.lowpass_freq, 
-            btype='low', 
-            fs=sr, 
-            output='sos'
-        )
-        degraded = scipy.signal.sosfilt(sos, noisy)
+        sos = design_butter(self.filter_order, self.lowpass_freq, sr, 'low')
+        degraded = scipy.signal.sosfilt(sos, reverb)
 
         return degraded
 
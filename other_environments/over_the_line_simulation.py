@@ -1,11 +1,14 @@
 import os
 from dataclasses import dataclass
-from typing import Optional, Tuple, Union
+from typing import List, Optional, Tuple, Union
 
 import librosa
 import numpy as np
 import scipy.signal
 import soundfile as sf
+from joblib import Parallel, delayed
+
+from utils import design_butter, resample_poly
 
 
 @dataclass
@@ -49,7 +52,7 @@ class EnvironmentSimulator:
 
     def _load_audio(self, path: str, sr: int = 16000) -> Tuple[np.ndarray, int]:
         """
-        Load audio file.
+        Load audio file as mono float32, resampling only if its rate differs.
         
         Args:
             path: Path to audio file
@@ -58,7 +61,19 @@ class EnvironmentSimulator:
         Returns:
             Tuple[np.ndarray, int]: (audio data, sample rate)
         """
-        audio, _ = librosa.load(path, sr=sr)
+        try:
+            with sf.SoundFile(path) as f:
+                file_sr = f.samplerate
+                audio = f.read(dtype='float32', always_2d=False)
+        except RuntimeError:
+            # libsndfile cannot decode every format (e.g. VoxCeleb2's m4a)
+            audio, _ = librosa.load(path, sr=sr)
+            return audio, sr
+        
+        if audio.ndim > 1:
+            audio = audio.mean(axis=1, dtype=np.float32)
+        if file_sr != sr:
+            audio = resample_poly(audio, file_sr, sr).astype(np.float32, copy=False)
         return audio, sr
 
     def _save_audio(self, path: str, audio: np.ndarray, sr: int) -> None:
@@ -89,7 +104,7 @@ class EnvironmentSimulator:
         Returns:
             np.ndarray: Filtered audio
         """
-        sos = scipy.signal.butter(order, freqs, btype='band', fs=sr, output='sos')
+        sos = design_butter(order, tuple(freqs), sr, 'band')
         return scipy.signal.sosfilt(sos, audio)
 
     def simulate_environment(self, 
@@ -122,18 +137,10 @@ class EnvironmentSimulator:
             audio_data = audio
             sr = config.sample_rate
 
-        # Apply downsampling if configured
+        # Apply downsampling if configured, with cached polyphase filters for both passes
         if config.down_sample_rate:
-            audio_down = librosa.resample(
-                audio_data, 
-                orig_sr=sr, 
-                target_sr=config.down_sample_rate
-            )
-            audio_up = librosa.resample(
-                audio_down, 
-                orig_sr=config.down_sample_rate, 
-                target_sr=sr
-            )
+            audio_down = resample_poly(audio_data, sr, config.down_sample_rate)
+            audio_up = resample_poly(audio_down, config.down_sample_rate, sr)
         else:
             audio_up = audio_data
 
@@ -157,6 +164,43 @@ class EnvironmentSimulator:
 
         return processed_audio, output_path
 
+    def simulate_batch(self, 
+                       paths: List[str],
+                       environment: Union[str, EnvironmentConfig],
+                       n_jobs: int = -1,
+                       output_filenames: Optional[List[str]] = None) -> List[Tuple[np.ndarray, str]]:
+        """
+        Simulate many audio files in a specific environment, in parallel processes.
+        
+        Args:
+            paths: Paths to audio files
+            environment: Environment name or configuration
+            n_jobs: Number of worker processes (-1 uses all cores)
+            output_filenames: Output filename for each path (default: the path
+                relative to the inputs' common directory, so files that share a
+                basename, like VoxCeleb's 00001.wav, do not overwrite each other)
+            
+        Returns:
+            List[Tuple[np.ndarray, str]]: (processed audio, output path) for each path
+        """
+        if not paths:
+            return []
+        if output_filenames is None:
+            root = os.path.commonpath([os.path.dirname(os.path.abspath(path)) for path in paths])
+            output_filenames = [os.path.relpath(os.path.abspath(path), root) for path in paths]
+        if len(output_filenames) != len(paths):
+            raise ValueError("Expected one output filename per path")
+        
+        # Create output subdirectories up front, so workers never race on makedirs
+        for output_dir in {os.path.dirname(os.path.join(self.output_dir, name)) for name in output_filenames}:
+            os.makedirs(output_dir, exist_ok=True)
+
+        # Each worker process keeps its own cache of filter designs
+        return Parallel(n_jobs=n_jobs, backend="loky", batch_size="auto")(
+            delayed(self.simulate_environment)(path, environment, output_filename)
+            for path, output_filename in zip(paths, output_filenames)
+        )
+
     def add_environment(self, config: EnvironmentConfig) -> None:
         """
         Add a new environment configuration.
@@ -1,24 +1,34 @@
-from typing import Dict, List, Literal, Tuple
+from typing import List, Literal, Optional, Tuple, Union
 
-from tasks import SpeakerVerification
+import numpy as np
+
+from tasks.speaker_verification import SpeakerVerification
 
 
 class ClosedSetIdentification:
+    __slots__ = ("verifier", "threshold", "_enrolled_ids", "_enrolled_matrix")
+
     def __init__(self, 
-                 backend: Literal["deep_speaker", "azure", "xvector"],
+                 backend: Literal["deep_speaker", "xvector"],
                  threshold: float = 0.5,
                  **kwargs):
         """
         Initialize the Closed Set Identification system.
         
         Args:
-            backend: The verification backend to use
+            backend: The verification backend to use; identification compares
+                speaker embeddings, so it needs a backend that exposes them
             threshold: Similarity threshold for identification
             **kwargs: Additional arguments for the specific backend
         """
+        if backend == "azure":
+            raise ValueError("Identification requires an embedding backend, got azure")
         self.verifier = SpeakerVerification(backend, threshold=threshold, **kwargs)
-        self.enrolled_speakers: Dict[str, bool] = {}  # speaker_id -> enrollment_status
         self.threshold = threshold
+        
+        # Unit-norm enrollment embeddings, one row per successfully enrolled speaker
+        self._enrolled_ids: List[str] = []
+        self._enrolled_matrix: Optional[np.ndarray] = None
 
     def enroll_speaker(self, speaker_id: str, wav_files: List[str]) -> bool:
         """
@@ -32,48 +42,54 @@ class ClosedSetIdentification:
             bool: True if enrollment was successful, False otherwise
         """
         success = self.verifier.enroll(wav_files)
-        self.enrolled_speakers[speaker_id] = success
+        
+        if success:
+            embedding = np.asarray(self.verifier.enrollment_embedding, dtype=np.float32).reshape(-1)
+            embedding = embedding / np.linalg.norm(embedding)
+            if speaker_id in self._enrolled_ids:
+                self._enrolled_matrix[self._enrolled_ids.index(speaker_id)] = embedding
+            else:
+                self._enrolled_ids.append(speaker_id)
+                self._enrolled_matrix = (
+                    embedding[np.newaxis] if self._enrolled_matrix is None
+                    else np.vstack([self._enrolled_matrix, embedding])
+                )
+        elif speaker_id in self._enrolled_ids:
+            # A failed re-enrollment drops the speaker's previous embedding
+            index = self._enrolled_ids.index(speaker_id)
+            del self._enrolled_ids[index]
+            self._enrolled_matrix = np.delete(self._enrolled_matrix, index, axis=0)
+        
         return success
 
-    def identify(self, wav_file_path: str) -> Tuple[str, float]:
+    def identify(self, 
+                 wav_file_path: Union[str, np.ndarray], 
+                 sr: Optional[int] = None) -> Tuple[str, float]:
         """
         Identify the speaker from the audio sample.
         In closed set identification, we always return the best match,
         even if it's below the threshold.
         
         Args:
-            wav_file_path: Path to the WAV file to identify
+            wav_file_path: Path to the WAV file to identify, or the audio data itself
+            sr: Sample rate of the audio data (ignored for paths)
             
         Returns:
             Tuple[str, float]: (speaker_id, similarity score)
             Returns the speaker with highest similarity score
         """
-        if not self.enrolled_speakers:
+        if not self._enrolled_ids:
             raise ValueError("No speakers enrolled in the system")
 
-        # Get verification result
-        is_verified, similarity = self.verifier.verify(wav_file_path)
-        
-        # In a real system, you would need to maintain a mapping of
-        # verification results to speaker IDs and compare against all enrolled speakers.
-        # This is a simplified version that assumes the verification result
-        # corresponds to the most recent enrollment.
-        best_speaker = None
-        best_score = -1.0
+        query = self.verifier.embed(wav_file_path, sr)
+        if query is None:
+            # Nothing to compare, fall back to the first enrolled speaker
+            return self._enrolled_ids[0], 0.0
         
-        for speaker_id, enrolled in self.enrolled_speakers.items():
-            if enrolled and similarity > best_score:
-                best_speaker = speaker_id
-                best_score = similarity
-        
-        if best_speaker is None:
-            # If no match found, return the first enrolled speaker
-            # (this is just for demonstration - in a real system,
-            # you would want to implement proper matching)
-            best_speaker = next(iter(self.enrolled_speakers.keys()))
-            best_score = 0.0
-            
-        return best_speaker, best_score
+        # Score against every enrolled speaker at once
+        scores = self._enrolled_matrix @ (query / np.linalg.norm(query))
+        best = int(scores.argmax())
+        return self._enrolled_ids[best], float(scores[best])
 
     def get_enrolled_speakers(self) -> List[str]:
         """
@@ -82,4 +98,4 @@ class ClosedSetIdentification:
         Returns:
             List[str]: List of speaker IDs
         """
-        return [speaker_id for speaker_id, enrolled in self.enrolled_speakers.items() if enrolled]
+        return list(self._enrolled_ids)
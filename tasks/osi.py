@@ -1,24 +1,34 @@
-from typing import Dict, List, Literal, Optional, Tuple
+from typing import List, Literal, Optional, Tuple, Union
 
-from tasks import SpeakerVerification
+import numpy as np
+
+from tasks.speaker_verification import SpeakerVerification
 
 
 class OpenSetIdentification:
+    __slots__ = ("verifier", "threshold", "_enrolled_ids", "_enrolled_matrix")
+
     def __init__(self, 
-                 backend: Literal["deep_speaker", "azure", "xvector"],
+                 backend: Literal["deep_speaker", "xvector"],
                  threshold: float = 0.5,
                  **kwargs):
         """
         Initialize the Open Set Identification system.
         
         Args:
-            backend: The verification backend to use
+            backend: The verification backend to use; identification compares
+                speaker embeddings, so it needs a backend that exposes them
             threshold: Similarity threshold for identification
             **kwargs: Additional arguments for the specific backend
         """
+        if backend == "azure":
+            raise ValueError("Identification requires an embedding backend, got azure")
         self.verifier = SpeakerVerification(backend, threshold=threshold, **kwargs)
-        self.enrolled_speakers: Dict[str, bool] = {}  # speaker_id -> enrollment_status
         self.threshold = threshold
+        
+        # Unit-norm enrollment embeddings, one row per successfully enrolled speaker
+        self._enrolled_ids: List[str] = []
+        self._enrolled_matrix: Optional[np.ndarray] = None
 
     def enroll_speaker(self, speaker_id: str, wav_files: List[str]) -> bool:
         """
@@ -32,36 +42,56 @@ class OpenSetIdentification:
             bool: True if enrollment was successful, False otherwise
         """
         success = self.verifier.enroll(wav_files)
-        self.enrolled_speakers[speaker_id] = success
+        
+        if success:
+            embedding = np.asarray(self.verifier.enrollment_embedding, dtype=np.float32).reshape(-1)
+            embedding = embedding / np.linalg.norm(embedding)
+            if speaker_id in self._enrolled_ids:
+                self._enrolled_matrix[self._enrolled_ids.index(speaker_id)] = embedding
+            else:
+                self._enrolled_ids.append(speaker_id)
+                self._enrolled_matrix = (
+                    embedding[np.newaxis] if self._enrolled_matrix is None
+                    else np.vstack([self._enrolled_matrix, embedding])
+                )
+        elif speaker_id in self._enrolled_ids:
+            # A failed re-enrollment drops the speaker's previous embedding
+            index = self._enrolled_ids.index(speaker_id)
+            del self._enrolled_ids[index]
+            self._enrolled_matrix = np.delete(self._enrolled_matrix, index, axis=0)
+        
         return success
 
-    def identify(self, wav_file_path: str) -> Tuple[Optional[str], float]:
+    def identify(self, 
+                 wav_file_path: Union[str, np.ndarray], 
+                 sr: Optional[int] = None) -> Tuple[Optional[str], float]:
         """
         Identify the speaker from the audio sample.
         
         Args:
-            wav_file_path: Path to the WAV file to identify
+            wav_file_path: Path to the WAV file to identify, or the audio data itself
+            sr: Sample rate of the audio data (ignored for paths)
             
         Returns:
             Tuple[Optional[str], float]: (speaker_id if identified, similarity score)
             Returns (None, score) if no match is found above threshold
         """
-        if not self.enrolled_speakers:
+        if not self._enrolled_ids:
             print("No speakers enrolled in the system")
             return None, 0.0
 
-        # Get verification result
-        is_verified, similarity = self.verifier.verify(wav_file_path)
+        query = self.verifier.embed(wav_file_path, sr)
+        if query is None:
+            return None, 0.0
         
-        if is_verified and similarity > self.threshold:
-            # In a real system, you would need to maintain a mapping of
-            # verification results to speaker IDs. This is a simplified version.
-            # You might want to implement a more sophisticated matching system.
-            for speaker_id, enrolled in self.enrolled_speakers.items():
-                if enrolled:
-                    return speaker_id, similarity
+        # Score against every enrolled speaker at once
+        scores = self._enrolled_matrix @ (query / np.linalg.norm(query))
+        best = int(scores.argmax())
+        score = float(scores[best])
+        if score > self.threshold:
+            return self._enrolled_ids[best], score
         
-        return None, similarity
+        return None, score
 
     def get_enrolled_speakers(self) -> List[str]:
         """
@@ -70,4 +100,4 @@ class OpenSetIdentification:
         Returns:
             List[str]: List of speaker IDs
         """
-        return [speaker_id for speaker_id, enrolled in self.enrolled_speakers.items() if enrolled]
+        return list(self._enrolled_ids)
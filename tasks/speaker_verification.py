@@ -1,11 +1,32 @@
-from typing import List, Literal, Tuple, Union
+import os
+from functools import lru_cache
+from typing import List, Literal, Optional, Tuple, Union
+
+import numpy as np
 
 from authentication_models import (AzureSpeakerVerification,
                                    DeepSpeakerVerification,
                                    XVectorVerification)
 
 
+# Backend constructors and the keyword arguments each one accepts
+_BACKENDS = {
+    "deep_speaker": (DeepSpeakerVerification, ("model_path", "threshold", "runtime", "dtype")),
+    "azure": (AzureSpeakerVerification, ("subscription_key", "region")),
+    "xvector": (XVectorVerification, ("model_path", "threshold", "device", "dtype")),
+}
+
+
+class _EmbeddingFailed(Exception):
+    """Raised inside the embedding cache so that failures are not memoized."""
+
+
 class SpeakerVerification:
+    __slots__ = ("backend", "verifier", "_embed_cached")
+
+    # Number of file embeddings kept by embed()
+    embed_cache_size = 4096
+
     def __init__(self, 
                  backend: Literal["deep_speaker", "azure", "xvector"],
                  **kwargs):
@@ -14,30 +35,60 @@ class SpeakerVerification:
         
         Args:
             backend: The verification backend to use ("deep_speaker", "azure", or "xvector")
-            **kwargs: Additional arguments for the specific backend:
-                - For deep_speaker: model_path, threshold
+            **kwargs: Additional arguments for the specific backend; arguments the
+                backend does not accept are ignored, omitted ones use its defaults:
+                - For deep_speaker: model_path, threshold, runtime, dtype
                 - For azure: subscription_key, region
-                - For xvector: model_path, threshold
+                - For xvector: model_path, threshold, device, dtype
         """
+        if backend not in _BACKENDS:
+            raise ValueError(f"Unsupported backend: {backend}")
+        
         self.backend = backend
+        cls, keys = _BACKENDS[backend]
+        self.verifier = cls(**{key: kwargs[key] for key in keys if key in kwargs})
         
-        if backend == "deep_speaker":
-            self.verifier = DeepSpeakerVerification(
-                model_path=kwargs.get("model_path"),
-                threshold=kwargs.get("threshold", 0.5)
-            )
-        elif backend == "azure":
-            self.verifier = AzureSpeakerVerification(
-                subscription_key=kwargs.get("subscription_key"),
-                region=kwargs.get("region", "eastus")
-            )
-        elif backend == "xvector":
-            self.verifier = XVectorVerification(
-                model_path=kwargs.get("model_path"),
-                threshold=kwargs.get("threshold", 0.5)
-            )
-        else:
-            raise ValueError(f"Unsupported backend: {backend}")
+        # File embeddings keyed by (abspath, mtime); the closure avoids holding self
+        verifier = self.verifier
+        def embed_file(path: str, mtime: float) -> np.ndarray:
+            embedding = verifier.embed(path)
+            if embedding is None:
+                raise _EmbeddingFailed(path)
+            embedding.setflags(write=False)
+            return embedding
+        self._embed_cached = lru_cache(maxsize=self.embed_cache_size)(embed_file)
+
+    @property
+    def enrollment_embedding(self) -> Optional[np.ndarray]:
+        """
+        The enrolled speaker's mean embedding, if the backend exposes embeddings.
+        """
+        return getattr(self.verifier, "enrollment_embedding", None)
+
+    def embed(self, 
+              wav_file_path: Union[str, np.ndarray], 
+              sr: Optional[int] = None) -> Optional[np.ndarray]:
+        """
+        Get the speaker embedding of a voice sample.
+        
+        Embeddings of files are cached until the file is modified, so the
+        returned array is read-only. Failures are not cached and are retried
+        on the next call.
+        
+        Args:
+            wav_file_path: Path to the WAV file containing the voice sample,
+                or the audio data itself
+            sr: Sample rate of the audio data (ignored for paths)
+            
+        Returns:
+            Optional[np.ndarray]: The float32 embedding vector, or None if processing fails
+        """
+        if isinstance(wav_file_path, str):
+            try:
+                return self._embed_cached(os.path.abspath(wav_file_path), os.path.getmtime(wav_file_path))
+            except _EmbeddingFailed:
+                return None
+        return self.verifier.embed(wav_file_path, sr)
 
     def enroll(self, wav_files: Union[str, List[str]]) -> bool:
         """
@@ -51,14 +102,34 @@ class SpeakerVerification:
         """
         return self.verifier.enroll(wav_files)
 
-    def verify(self, wav_file_path: str) -> Tuple[bool, float]:
+    def verify(self, 
+               wav_file_path: Union[str, np.ndarray], 
+               sr: Optional[int] = None) -> Tuple[bool, float]:
         """
         Verify a speaker using their voice sample.
         
         Args:
-            wav_file_path: Path to the WAV file containing the voice sample to verify
+            wav_file_path: Path to the WAV file containing the voice sample to verify,
+                or the audio data itself
+            sr: Sample rate of the audio data (ignored for paths)
             
         Returns:
             Tuple[bool, float]: (verification result, similarity score)
         """
-        return self.verifier.verify(wav_file_path) 
\ No newline at end of file
+        return self.verifier.verify(wav_file_path, sr)
+
+    def verify_batch(self, 
+                     wav_files: List[Union[str, np.ndarray]], 
+                     srs: Optional[List[Optional[int]]] = None) -> List[Tuple[bool, float]]:
+        """
+        Verify a speaker using several voice samples.
+        
+        Args:
+            wav_files: List of WAV file paths or audio data to verify
+            srs: Sample rates of the audio data, in the same order as wav_files
+                (default: all None, for paths)
+            
+        Returns:
+            List[Tuple[bool, float]]: (verification result, similarity score) for each sample
+        """
+        return self.verifier.verify_batch(wav_files, srs) 
\ No newline at end of file
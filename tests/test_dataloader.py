@@ -0,0 +1,82 @@
+import json
+import os
+
+import pytest
+
+from dataloaders.dataloader import DataLoader
+
+
+def _loader(dataset, base_path, gender_metadata=None):
+    # Bypass __init__, which always points at the repository's data folder
+    loader = object.__new__(DataLoader)
+    loader.dataset = dataset
+    loader.base_path = base_path
+    loader.gender_metadata = gender_metadata
+    return loader
+
+
+def _touch(path):
+    path.parent.mkdir(parents=True, exist_ok=True)
+    path.touch()
+    return str(path)
+
+
+def test_voxceleb2_collects_m4a_files(tmp_path):
+    m4a = _touch(tmp_path / "id00012" / "21Uxsk56VDQ" / "00001.m4a")
+    _touch(tmp_path / "id00012" / "21Uxsk56VDQ" / "00001.wav")
+
+    assert _loader("VoxCeleb2", tmp_path)._scan_files() == {"id00012": [m4a]}
+
+
+def test_librispeech_groups_files_by_speaker_across_subsets(tmp_path):
+    first = _touch(tmp_path / "dev-clean" / "84" / "121123" / "84-121123-0000.flac")
+    second = _touch(tmp_path / "test-clean" / "84" / "121550" / "84-121550-0000.flac")
+    other = _touch(tmp_path / "dev-clean" / "174" / "50561" / "174-50561-0000.flac")
+
+    files = _loader("LibriSpeech", tmp_path)._scan_files()
+    assert sorted(files) == ["174", "84"]
+    assert sorted(files["84"]) == sorted([first, second])
+    assert files["174"] == [other]
+
+
+def test_scan_cache_is_reused(tmp_path, monkeypatch):
+    _touch(tmp_path / "id10001" / "1zcIwhmdeo4" / "00001.wav")
+    loader = _loader("VoxCeleb1", tmp_path)
+
+    files = loader._collect_files()
+    assert (tmp_path / DataLoader.CACHE_FILENAME).exists()
+
+    monkeypatch.setattr(loader, "_scan_files", lambda: pytest.fail("cache was not reused"))
+    assert loader._collect_files() == files
+
+
+def test_scan_cache_with_stale_tag_is_ignored(tmp_path):
+    wav = _touch(tmp_path / "id10001" / "1zcIwhmdeo4" / "00001.wav")
+    stale = {"tag": {"version": 1, "dataset": "VoxCeleb1", "ext": "wav"}, "files": {"stale": []}}
+    (tmp_path / DataLoader.CACHE_FILENAME).write_text(json.dumps(stale))
+    os.utime(tmp_path, (0, 0))  # the cache is newer than the folder
+
+    assert _loader("VoxCeleb1", tmp_path)._collect_files() == {"id10001": [wav]}
+
+
+def test_librispeech_gender_metadata_allows_pipes_in_names(tmp_path):
+    speakers = tmp_path / "SPEAKERS.TXT"
+    speakers.write_text(
+        "; ID      |SEX| SUBSET           |MINUTES| NAME\n"
+        "14      | F | train-clean-360  | 25.03 | Kristin LeMoine\n"
+        "60      | M | train-clean-100  | 20.18 | |CBW|Simon\n"
+    )
+
+    assert _loader("LibriSpeech", tmp_path, speakers)._load_gender_metadata() == {"14": "f", "60": "m"}
+
+
+def test_voxceleb_gender_metadata_uses_gender_column(tmp_path):
+    pytest.importorskip("pandas")
+    meta = tmp_path / "vox1_meta.csv"
+    meta.write_text(
+        "VoxCeleb1 ID\tVGGFace1 ID\tGender\tNationality\tSet\n"
+        "id10001\tA.J._Buckley\tm\tIreland\tdev\n"
+        "id10002\tA.R._Rahman\tf\tIndia\tdev\n"
+    )
+
+    assert _loader("VoxCeleb1", tmp_path, meta)._load_gender_metadata() == {"id10001": "m", "id10002": "f"}
@@ -0,0 +1,44 @@
+import os
+import stat
+import tarfile
+import zipfile
+
+from dataloaders.download_dataset import extract_archive, extract_zip_parallel
+
+
+def test_extract_zip_parallel_keeps_members_inside_target(tmp_path):
+    archive = tmp_path / "archive.zip"
+    with zipfile.ZipFile(archive, "w") as zip_ref:
+        zip_ref.writestr("wav/id10001/00001.wav", b"one")
+        zip_ref.writestr("wav/id10002/", b"")
+        zip_ref.writestr("../escape.txt", b"up")
+        zip_ref.writestr("/absolute/file.txt", b"abs")
+        zip_ref.writestr("a/./../b.txt", b"dots")
+    out = tmp_path / "out"
+    out.mkdir()
+
+    extract_zip_parallel(str(archive), str(out))
+
+    assert (out / "wav" / "id10001" / "00001.wav").read_bytes() == b"one"
+    assert (out / "wav" / "id10002").is_dir()
+    assert (out / "escape.txt").read_bytes() == b"up"
+    assert (out / "absolute" / "file.txt").read_bytes() == b"abs"
+    assert (out / "a" / "b.txt").read_bytes() == b"dots"
+    assert not (tmp_path / "escape.txt").exists()
+
+
+def test_extract_tar_restores_directory_modes(tmp_path):
+    source = tmp_path / "src" / "dev-clean" / "84"
+    source.mkdir(parents=True)
+    (source / "84-121123-0000.flac").write_bytes(b"flac")
+    os.chmod(source, 0o755)
+    os.chmod(source.parent, 0o755)
+    archive = tmp_path / "dev-clean.tar.gz"
+    with tarfile.open(archive, "w:gz") as tar:
+        tar.add(source.parent, arcname="dev-clean")
+
+    extract_archive(str(archive), str(tmp_path / "out"))
+
+    extracted = tmp_path / "out" / "dev-clean" / "84"
+    assert stat.S_IMODE(os.stat(extracted).st_mode) == 0o755
+    assert (extracted / "84-121123-0000.flac").read_bytes() == b"flac"
@@ -0,0 +1,32 @@
+import numpy as np
+import scipy.signal
+
+from other_environments.over_the_air_simulation import AirEnvironmentSimulator
+from utils import helpers
+
+
+def test_design_butter_is_accepted_by_sosfilt():
+    sos = helpers.design_butter(4, 4000.0, 16000, 'low')
+    x = np.random.default_rng(0).standard_normal(1000).astype(np.float32)
+
+    # The cached design is shared between calls and must stay usable by scipy
+    first = scipy.signal.sosfilt(sos, x)
+    second = scipy.signal.sosfilt(helpers.design_butter(4, 4000.0, 16000, 'low'), x)
+    np.testing.assert_allclose(first, second)
+
+
+def test_sparse_reverb_without_numba(monkeypatch):
+    monkeypatch.setattr(helpers, "njit", None)
+    x = np.arange(5, dtype=np.float32)
+
+    reverb = helpers.sparse_reverb(x, np.array([0, 2]), np.array([1.0, 0.5]))
+    np.testing.assert_allclose(reverb, [0.0, 1.0, 2.0, 3.5, 5.0])
+
+
+def test_air_simulation_without_numba(monkeypatch):
+    monkeypatch.setattr(helpers, "njit", None)
+    audio = np.random.default_rng(0).standard_normal(16000).astype(np.float32)
+
+    degraded = AirEnvironmentSimulator().simulate(audio, 16000)
+    assert degraded.shape == audio.shape
+    assert np.all(np.isfinite(degraded))
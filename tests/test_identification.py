@@ -0,0 +1,97 @@
+import numpy as np
+import pytest
+
+csi = pytest.importorskip("tasks.csi")
+osi = pytest.importorskip("tasks.osi")
+
+EMBEDDINGS = {
+    "a1": np.array([1.0, 0.0, 0.0], dtype=np.float32),
+    "a2": np.array([0.9, 0.1, 0.0], dtype=np.float32),
+    "b1": np.array([0.0, 1.0, 0.0], dtype=np.float32),
+    "query_a": np.array([1.0, 0.05, 0.0], dtype=np.float32),
+    "query_b": np.array([0.1, 1.0, 0.0], dtype=np.float32),
+    "query_c": np.array([0.0, 0.0, 1.0], dtype=np.float32),
+}
+
+
+class FakeVerifier:
+    """Stands in for SpeakerVerification, with a fixed embedding per file."""
+
+    def __init__(self, backend, **kwargs):
+        self.enrollment_embedding = None
+
+    def enroll(self, wav_files):
+        embeddings = [EMBEDDINGS[f] for f in wav_files if f in EMBEDDINGS]
+        if not embeddings:
+            return False
+        self.enrollment_embedding = np.mean(embeddings, axis=0, keepdims=True)
+        return True
+
+    def embed(self, wav_file_path, sr=None):
+        return EMBEDDINGS.get(wav_file_path)
+
+
+@pytest.fixture
+def make_system(monkeypatch):
+    monkeypatch.setattr(csi, "SpeakerVerification", FakeVerifier)
+    monkeypatch.setattr(osi, "SpeakerVerification", FakeVerifier)
+
+    def make(cls, threshold=0.5):
+        system = cls("deep_speaker", threshold=threshold)
+        assert system.enroll_speaker("a", ["a1", "a2"])
+        assert system.enroll_speaker("b", ["b1"])
+        return system
+    return make
+
+
+def test_csi_identifies_the_closest_speaker(make_system):
+    system = make_system(csi.ClosedSetIdentification)
+
+    speaker_id, score = system.identify("query_b")
+    assert speaker_id == "b"
+    assert score == pytest.approx(float(EMBEDDINGS["query_b"] @ EMBEDDINGS["b1"]) / np.linalg.norm(EMBEDDINGS["query_b"]))
+    assert system.identify("query_a")[0] == "a"
+
+
+def test_csi_reenrollment_replaces_or_drops_the_speaker(make_system):
+    system = make_system(csi.ClosedSetIdentification)
+
+    # A successful re-enrollment replaces the speaker's embedding in place
+    assert system.enroll_speaker("a", ["query_c"])
+    assert system.get_enrolled_speakers() == ["a", "b"]
+    assert system.identify("query_c")[0] == "a"
+
+    # A failed re-enrollment removes the speaker
+    assert not system.enroll_speaker("b", ["missing"])
+    assert system.get_enrolled_speakers() == ["a"]
+    assert system.identify("query_b")[0] == "a"
+
+
+def test_csi_without_embedding_falls_back_to_first_speaker(make_system):
+    system = make_system(csi.ClosedSetIdentification)
+
+    assert system.identify("missing") == ("a", 0.0)
+
+
+def test_csi_requires_enrolled_speakers(monkeypatch):
+    monkeypatch.setattr(csi, "SpeakerVerification", FakeVerifier)
+    system = csi.ClosedSetIdentification("deep_speaker")
+
+    with pytest.raises(ValueError):
+        system.identify("query_a")
+
+
+def test_osi_rejects_scores_below_threshold(make_system):
+    system = make_system(osi.OpenSetIdentification, threshold=0.5)
+
+    assert system.identify("query_a")[0] == "a"
+    speaker_id, score = system.identify("query_c")
+    assert speaker_id is None
+    assert score == pytest.approx(0.0)
+    assert system.identify("missing") == (None, 0.0)
+
+
+@pytest.mark.parametrize("module, name", [(csi, "ClosedSetIdentification"), (osi, "OpenSetIdentification")])
+def test_identification_rejects_azure(module, name):
+    with pytest.raises(ValueError):
+        getattr(module, name)("azure")
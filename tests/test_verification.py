@@ -0,0 +1,31 @@
+import numpy as np
+import pytest
+
+
+def test_deepspeaker_verify_batch_keeps_order_with_failed_inputs(monkeypatch):
+    deepspeaker = pytest.importorskip("authentication_models.deepspeaker")
+    verifier = object.__new__(deepspeaker.DeepSpeakerVerification)
+    verifier.threshold = 0.5
+    verifier.enrollment_embedding = np.array([[1.0, 0.0]], dtype=np.float32)
+    features = {"same": np.array([1.0, 0.0]), "other": np.array([0.0, 1.0])}
+    monkeypatch.setattr(verifier, "_compute_mfcc", lambda audio, sr=None: features.get(audio))
+    monkeypatch.setattr(verifier, "_embed_batch", lambda mfccs: np.stack(mfccs))
+
+    results = verifier.verify_batch(["bad", "same", "other", "bad"])
+    assert [verified for verified, _ in results] == [False, True, False, False]
+    np.testing.assert_allclose([score for _, score in results], [0.0, 1.0, 0.0, 0.0], atol=1e-6)
+
+
+def test_xvector_verify_batch_keeps_order_with_failed_inputs(monkeypatch):
+    xvectors = pytest.importorskip("authentication_models.xvectors")
+    torch = pytest.importorskip("torch")
+    verifier = object.__new__(xvectors.XVectorVerification)
+    verifier.threshold = 0.5
+    verifier._enrollment_tensor = torch.tensor([[1.0, 0.0]])
+    verifier.enrollment_embedding = verifier._enrollment_tensor.numpy()
+    embeddings = {"same": torch.tensor([[1.0, 0.0]]), "other": torch.tensor([[0.0, 1.0]])}
+    monkeypatch.setattr(verifier, "_get_embedding", lambda audio, sr=None: embeddings.get(audio))
+
+    results = verifier.verify_batch(["other", "bad", "same"])
+    assert [verified for verified, _ in results] == [False, False, True]
+    np.testing.assert_allclose([score for _, score in results], [0.0, 0.0, 1.0], atol=1e-6)
@@ -1 +1,2 @@
-from .helpers import cosine_similarity
\ No newline at end of file
+from .helpers import (cosine_similarity, cosine_similarity_matrix, design_butter,
+                      design_resample_filter, resample_poly, sparse_reverb)
\ No newline at end of file
@@ -1,10 +1,37 @@
+from functools import lru_cache
+from math import gcd
+from typing import Tuple, Union
+
 import numpy as np
+import scipy.signal
+
+try:
+    from numba import njit
+except ImportError:  # numba is optional, the numpy/scipy paths are used without it
+    njit = None
+
+
+def _normalize_rows(x: np.ndarray) -> np.ndarray:
+    """
+    Scale each row of a matrix to unit L2 norm, in float32.
+    
+    Args:
+        x: Matrix with one vector per row
+        
+    Returns:
+        np.ndarray: Contiguous float32 matrix of unit-norm rows
+    """
+    x = np.ascontiguousarray(x, dtype=np.float32)
+    return x / np.linalg.norm(x, axis=1, keepdims=True)
 
 
 def cosine_similarity(a: np.ndarray, b: np.ndarray) -> float:
     """
     Calculate cosine similarity between two vectors.
     
+    Rows are compared pairwise, and a single row broadcasts against all rows
+    of the other argument.
+    
     Args:
         a: First vector
         b: Second vector
@@ -12,8 +39,117 @@ def cosine_similarity(a: np.ndarray, b: np.ndarray) -> float:
     Returns:
         float: Cosine similarity score
     """
-    a = np.array(a)
-    b = np.array(b)
-    a_norm = np.linalg.norm(a, axis=1, keepdims=True)
-    b_norm = np.linalg.norm(b, axis=1, keepdims=True)
-    return np.sum(a * b, axis=1) / (a_norm.flatten() * b_norm.flatten())
+    return np.einsum('...j,...j->...', _normalize_rows(a), _normalize_rows(b))
+
+
+def cosine_similarity_matrix(a: np.ndarray, b: np.ndarray) -> np.ndarray:
+    """
+    Calculate cosine similarity between every pair of rows of two matrices.
+    
+    Args:
+        a: First matrix, one vector per row
+        b: Second matrix, one vector per row
+        
+    Returns:
+        np.ndarray: Similarity matrix of shape (len(a), len(b))
+    """
+    return _normalize_rows(a) @ _normalize_rows(b).T
+
+
+@lru_cache(maxsize=32)
+def design_butter(order: int, 
+                  freqs: Union[float, Tuple[float, float]], 
+                  sr: int, 
+                  btype: str) -> np.ndarray:
+    """
+    Design a Butterworth filter in second-order sections, caching the result.
+    
+    Args:
+        order: Filter order
+        freqs: Cutoff frequency, or (low_freq, high_freq) for band filters
+        sr: Sample rate
+        btype: Filter type ('low', 'high', 'band' or 'bandstop')
+        
+    Returns:
+        np.ndarray: Second-order sections of the filter, shared between calls
+        and not to be modified
+    """
+    # Left writable: scipy.signal.sosfilt rejects read-only coefficient buffers
+    return scipy.signal.butter(order, freqs, btype=btype, fs=sr, output='sos')
+
+
+@lru_cache(maxsize=32)
+def design_resample_filter(up: int, down: int) -> np.ndarray:
+    """
+    Design the polyphase anti-aliasing filter for a rational resampling ratio,
+    caching the result.
+    
+    The filter is the one scipy.signal.resample_poly designs by default, and
+    can be passed back to it as the window argument.
+    
+    Args:
+        up: Upsampling factor
+        down: Downsampling factor
+        
+    Returns:
+        np.ndarray: Read-only FIR filter coefficients
+    """
+    max_rate = max(up, down) // gcd(up, down)
+    h = scipy.signal.firwin(2 * 10 * max_rate + 1, 1.0 / max_rate, window=('kaiser', 5.0))
+    h.setflags(write=False)
+    return h
+
+
+def resample_poly(x: np.ndarray, orig_sr: int, target_sr: int) -> np.ndarray:
+    """
+    Resample a signal with polyphase filtering, reusing cached filter designs.
+    
+    Args:
+        x: Input signal
+        orig_sr: Sample rate of the input
+        target_sr: Desired sample rate
+        
+    Returns:
+        np.ndarray: Resampled signal
+    """
+    g = gcd(orig_sr, target_sr)
+    up, down = target_sr // g, orig_sr // g
+    return scipy.signal.resample_poly(x, up, down, window=design_resample_filter(up, down))
+
+
+if njit is not None:
+    @njit(cache=True, fastmath=True, nogil=True)
+    def _sparse_reverb_kernel(audio, delays, amps):
+        n = audio.shape[0]
+        out = np.zeros(n, dtype=audio.dtype)
+        for k in range(delays.shape[0]):
+            delay = delays[k]
+            amp = amps[k]
+            for i in range(delay, n):
+                out[i] += amp * audio[i - delay]
+        return out
+
+
+def sparse_reverb(audio: np.ndarray, delays: np.ndarray, amps: np.ndarray) -> np.ndarray:
+    """
+    Convolve audio with a sparse impulse response by delaying and adding each tap.
+    
+    Uses a compiled kernel when numba is installed.
+    
+    Args:
+        audio: Input audio data
+        delays: Delay of each tap in samples
+        amps: Amplitude of each tap
+        
+    Returns:
+        np.ndarray: Reverberated audio, truncated to the input length
+    """
+    audio = np.ascontiguousarray(audio, dtype=np.result_type(audio.dtype, np.float32))
+    if njit is not None:
+        return _sparse_reverb_kernel(audio, np.asarray(delays, dtype=np.int64), np.asarray(amps, dtype=np.float64))
+    
+    reverb = np.zeros(len(audio), dtype=audio.dtype)
+    for delay, amp in zip(delays, amps):
+        if delay < len(audio):
+            reverb[delay:] += amp * audio[:len(audio) - delay]
+    return reverb